@@ -0,0 +1,29 @@
+"""
+Direct run: `python -m app`.
+
+Kept tiny on purpose. Spawned child processes (uvicorn workers, the PPTX
+pool) never re-import a `__main__` module, so none of them pays for the
+app import twice.
+"""
+import os
+import sys
+
+import uvicorn
+
+from app.core.config import settings
+
+# reload mode only supports a single worker
+workers = 1 if settings.DEBUG else (os.cpu_count() or 2)
+# uvicorn's default for --workers; the services size their pools from it
+os.environ["WEB_CONCURRENCY"] = str(workers)
+
+uvicorn.run(
+    "app.main:app",
+    host=settings.BACKEND_HOST,
+    port=settings.BACKEND_PORT,
+    reload=settings.DEBUG,
+    # uvloop has no Windows build; fall back to the stock asyncio loop there
+    loop="asyncio" if sys.platform == "win32" else "uvloop",
+    http="httptools",
+    workers=workers,
+)
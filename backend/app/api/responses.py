@@ -0,0 +1,38 @@
+import asyncio
+import os
+
+from fastapi.responses import FileResponse
+from starlette.types import Receive, Scope, Send
+
+
+PATHSEND_EXTENSION = "http.response.pathsend"
+PPTX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+
+
+class PathSendResponse(FileResponse):
+    """
+    FileResponse that hands the file path to the ASGI server through the
+    `http.response.pathsend` extension when the server advertises it, so the
+    copy is done by the server (sendfile) instead of chunked reads on the
+    event loop. Behaves exactly like FileResponse otherwise.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if PATHSEND_EXTENSION not in scope.get("extensions", {}) or scope.get("method") == "HEAD":
+            await super().__call__(scope, receive, send)
+            return
+
+        if self.stat_result is None:
+            self.set_stat_headers(await asyncio.to_thread(os.stat, self.path))
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+        await send({"type": PATHSEND_EXTENSION, "path": str(self.path)})
+
+        if self.background is not None:
+            await self.background()
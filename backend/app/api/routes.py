@@ -1,6 +1,8 @@
-from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Response, status
+import asyncio
+import logging
 import os
+import re
 
 from app.models.schemas import (
     PresentationRequest,
@@ -9,32 +11,49 @@ from app.models.schemas import (
     ErrorResponse
 )
 from app.services.presentation_service import presentation_service
-from app.core.config import settings
+from app.core.config import settings, PRESENTATIONS_DIR
+from app.api.responses import PathSendResponse, PPTX_MEDIA_TYPE
 
 
+log = logging.getLogger("eduslide.api")
+
 # Create API router
 router = APIRouter()
 
+# IDs are generated as "pres_<hex>"; anything else can't name a file of ours
+_PRESENTATION_ID_RE = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+
+# Settings are fixed after startup, so the health payload is rendered once
+_HEALTH_BODY = HealthResponse(
+    status="healthy",
+    version=settings.PROJECT_VERSION,
+    environment=settings.ENVIRONMENT,
+    services={
+        "groq": "configured" if settings.GROQ_API_KEY else "not configured",
+        "pexels": "configured" if settings.PEXELS_API_KEY else "not configured",
+        "qdrant": "pending"
+    }
+).model_dump_json().encode()
+
 
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint."""
-    return HealthResponse(
-        status="healthy",
-        version=settings.PROJECT_VERSION,
-        environment=settings.ENVIRONMENT,
-        services={
-            "groq": "configured" if settings.GROQ_API_KEY else "not configured",
-            "pexels": "configured" if settings.PEXELS_API_KEY else "not configured",
-            "qdrant": "pending"
-        }
-    )
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 @router.post(
     "/generate",
     response_model=PresentationResponse,
-    status_code=status.HTTP_201_CREATED
+    status_code=status.HTTP_201_CREATED,
+    # inline=true answers with the .pptx itself instead of the JSON model
+    responses={
+        status.HTTP_201_CREATED: {
+            "content": {PPTX_MEDIA_TYPE: {}},
+            "description": "Slide JSON, or the PPTX file when `inline=true`",
+        }
+    }
 )
 async def generate_presentation(request: PresentationRequest):
     """
@@ -46,6 +65,10 @@ async def generate_presentation(request: PresentationRequest):
     3. Fetches relevant images from Pexels (FREE)
     4. Builds and saves a PPTX file on disk
     5. Returns structured slide data + metadata (client handles download)
+
+    With `inline=true` the PPTX is built in memory and returned directly
+    as the response body instead (no /download round-trip). The file is
+    still saved in the background so /download works afterwards.
     """
     try:
         # Validate request
@@ -56,6 +79,17 @@ async def generate_presentation(request: PresentationRequest):
                 detail=error_message
             )
 
+        if request.inline:
+            presentation_id, pptx_bytes = await presentation_service.generate_presentation_inline(request)
+            return Response(
+                content=pptx_bytes,
+                status_code=status.HTTP_201_CREATED,
+                media_type=PPTX_MEDIA_TYPE,
+                headers={
+                    "Content-Disposition": f'attachment; filename="eduslide_ai_{presentation_id}.pptx"'
+                }
+            )
+
         # Generate presentation (slides + PPTX)
         presentation = await presentation_service.generate_presentation(request)
         return presentation
@@ -64,7 +98,7 @@ async def generate_presentation(request: PresentationRequest):
         # Re-raise HTTP exceptions directly
         raise
     except Exception as e:
-        print(f"Error in generate_presentation: {e}")
+        log.error("Error in generate_presentation: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to generate presentation: {str(e)}"
@@ -76,23 +110,32 @@ async def download_presentation(presentation_id: str):
     """
     Download a generated PowerPoint (.pptx) file by presentation ID.
     The file is created by PresentationService and stored in 'generated_presentations/'.
+    Served with zero-copy pathsend when the ASGI server supports it.
     """
-    # Compute path to generated_presentations folder (backend root)
-    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-    presentations_dir = os.path.join(base_dir, "generated_presentations")
+    # Reject path tricks ("..", "/") before touching the filesystem
+    if not _PRESENTATION_ID_RE.fullmatch(presentation_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid presentation ID"
+        )
+
     filename = f"eduslide_ai_{presentation_id}.pptx"
-    file_path = os.path.join(presentations_dir, filename)
+    file_path = os.path.join(PRESENTATIONS_DIR, filename)
 
-    if not os.path.exists(file_path):
+    # Stat off the event loop; the result also feeds Content-Length/ETag
+    try:
+        stat_result = await asyncio.to_thread(os.stat, file_path)
+    except FileNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Presentation file not found"
         )
 
-    return FileResponse(
+    return PathSendResponse(
         file_path,
-        media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation",
-        filename=filename
+        media_type=PPTX_MEDIA_TYPE,
+        filename=filename,
+        stat_result=stat_result
     )
 
 
@@ -1,4 +1,7 @@
-from pydantic_settings import BaseSettings
+import os
+
+from pydantic import model_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
 class Settings(BaseSettings):
     """Application settings and configuration."""
@@ -29,12 +32,39 @@ class Settings(BaseSettings):
     PROJECT_NAME: str = "EduSlide AI"
     PROJECT_VERSION: str = "1.0.0"
     
-        # CORS Settings
-    ALLOWED_ORIGINS: list[str] = ["*"]
+    # CORS Settings (empty = derive from FRONTEND_URL)
+    ALLOWED_ORIGINS: list[str] = []
 
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
+
+    @model_validator(mode="after")
+    def _default_allowed_origins(self) -> "Settings":
+        """
+        An explicit origin list lets CORSMiddleware send a fixed
+        Access-Control-Allow-Origin instead of echoing every request's
+        Origin ("*" + credentials is not valid CORS anyway).
+        """
+        if not self.ALLOWED_ORIGINS:
+            frontend = self.FRONTEND_URL.rstrip("/")
+            origins = [frontend]
+            if "://localhost" in frontend:
+                origins.append(frontend.replace("://localhost", "://127.0.0.1"))
+            self.ALLOWED_ORIGINS = origins
+        return self
 # Create global settings instance
-settings = Settings()
\ No newline at end of file
+settings = Settings()
+
+
+# Backend root and the directory where generated PPTX files are saved
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+PRESENTATIONS_DIR = os.path.join(BASE_DIR, "generated_presentations")
+os.makedirs(PRESENTATIONS_DIR, exist_ok=True)
+
+# Content-addressed cache of downloaded slide images (keyed by URL hash)
+IMAGE_CACHE_DIR = os.path.join(BASE_DIR, "image_cache")
+os.makedirs(IMAGE_CACHE_DIR, exist_ok=True)
+
+# Finished decks keyed by request hash, for replaying identical requests
+PRES_CACHE_DIR = os.path.join(BASE_DIR, "pres_cache")
+os.makedirs(PRES_CACHE_DIR, exist_ok=True)
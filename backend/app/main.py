@@ -1,7 +1,45 @@
+import logging
+import logging.handlers
+import queue
+from typing import Optional
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from app.core.config import settings
-from app.api.routes import router
+
+
+# ----------------------------------------------------
+# Non-blocking logging: handlers only enqueue records,
+# a background listener thread does the actual writes
+# ----------------------------------------------------
+def _setup_logging() -> Optional[logging.handlers.QueueListener]:
+    app_logger = logging.getLogger("eduslide")
+    if app_logger.handlers:
+        # Already configured (module imported twice, e.g. via __main__)
+        return None
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(levelname)s:     %(name)s - %(message)s"))
+
+    app_logger.setLevel(logging.INFO)
+    app_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    app_logger.propagate = False
+
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
+
+
+# Before the imports below: they build the service singletons, which log
+# at import time (model banner, cache load warnings)
+_log_listener = _setup_logging()
+log = logging.getLogger("eduslide.main")
+
+from app.api.routes import router  # noqa: E402
+from app.services.image_service import image_service  # noqa: E402
+from app.services.presentation_service import presentation_service  # noqa: E402
 
 # Create FastAPI application
 app = FastAPI(
@@ -9,7 +47,9 @@ app = FastAPI(
     version=settings.PROJECT_VERSION,
     description="AI-Powered Personalized Presentation Generation Platform for Educators",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    # orjson (C) instead of stdlib json for every JSON response
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -30,27 +70,30 @@ app.include_router(router)
 # ----------------------------------------------------
 @app.on_event("startup")
 async def startup_event():
-    print("🚀 Starting EduSlide AI v1.0.0")
-    print(f"📝 Environment: {settings.ENVIRONMENT}")
-    print(f"🔗 API Docs: http://{settings.BACKEND_HOST}:{settings.BACKEND_PORT}/docs")
-    print(f"✅ Groq AI: {'Configured' if settings.GROQ_API_KEY else 'Missing'}")
-    print(f"🖼️  Pexels: {'Configured' if settings.PEXELS_API_KEY else 'Using placeholders'}")
+    log.info("🚀 Starting EduSlide AI v%s", settings.PROJECT_VERSION)
+    log.info("📝 Environment: %s", settings.ENVIRONMENT)
+    log.info("🔗 API Docs: http://%s:%s/docs", settings.BACKEND_HOST, settings.BACKEND_PORT)
+    log.info("✅ Groq AI: %s", "Configured" if settings.GROQ_API_KEY else "Missing")
+    log.info("🖼️  Pexels: %s", "Configured" if settings.PEXELS_API_KEY else "Using placeholders")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Run on application shutdown."""
-    print("👋 Shutting down EduSlide AI API")
+    await image_service.aclose()
+    await presentation_service.aclose()
+    log.info("👋 Shutting down EduSlide AI API")
+    if _log_listener is not None:
+        _log_listener.stop()
 
 
 # ----------------------------------------------------
 # 🔥 DIRECT PYTHON RUN SUPPORT (OPTIONAL)
+# `python -m app` is the launcher; this keeps `python -m app.main` working.
+# Running it via runpy makes `app.__main__` the main module, which spawned
+# processes (uvicorn workers, the PPTX pool) skip instead of re-importing
+# this whole module as `__mp_main__`.
 # ----------------------------------------------------
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(
-        "app.main:app",
-        host=settings.BACKEND_HOST,
-        port=settings.BACKEND_PORT,
-        reload=settings.DEBUG
-    )
+    import runpy
+    runpy.run_module("app", run_name="__main__", alter_sys=True)
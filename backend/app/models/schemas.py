@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict, Any
 from enum import Enum
 class AudienceLevel(str, Enum):
@@ -43,9 +43,10 @@ class PresentationRequest(BaseModel):
     include_quiz: bool = Field(default=False)
     speaker_notes: bool = Field(default=False)
     color_theme: ColorTheme = Field(default=ColorTheme.PURPLE)
+    inline: bool = Field(default=False, description="Return the PPTX file directly instead of slide JSON")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "topic": "Photosynthesis for Class 10 students",
                 "audience_level": "middle",
@@ -57,6 +58,7 @@ class PresentationRequest(BaseModel):
                 "color_theme": "blue"
             }
         }
+    )
 class SlideContent(BaseModel):
     """Individual slide content."""
     type: SlideType
@@ -76,8 +78,8 @@ class PresentationResponse(BaseModel):
     created_at: str
     generation_time: float
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "presentation_id": "pres_123456",
                 "metadata": {
@@ -91,6 +93,7 @@ class PresentationResponse(BaseModel):
                 "generation_time": 12.5
             }
         }
+    )
 class ErrorResponse(BaseModel):
     """Error response model."""
     error: str
@@ -1,14 +1,218 @@
+import asyncio
 import hashlib
-from typing import Optional, List, Set
+import logging
+import re
+from collections import OrderedDict, namedtuple
+from functools import cached_property
+from typing import Awaitable, Optional, List, Set, FrozenSet, Tuple
 
-import requests
+import httpx
 from app.core.config import settings
 
 # OpenAI is optional – hybrid mode works even if it's missing
 try:
-    from openai import OpenAI  # type: ignore
+    from openai import AsyncOpenAI  # type: ignore
 except ImportError:  # pragma: no cover - optional dependency
-    OpenAI = None
+    AsyncOpenAI = None
+
+log = logging.getLogger("eduslide.image")
+
+# Max number of distinct Pexels queries kept in memory
+PEXELS_CACHE_SIZE = 512
+
+# Host serving the deterministic fallback images
+PLACEHOLDER_IMAGE_BASE = "https://picsum.photos/seed/"
+
+# Per-request timeout of the Pexels client
+PEXELS_TIMEOUT = 10.0
+
+# Seconds to wait for the OpenAI / Pexels race before falling back; never
+# shorter than the Pexels timeout, so a slow but valid reply isn't cancelled
+IMAGE_RACE_TIMEOUT = PEXELS_TIMEOUT + 2.0
+
+# ----------------------------------------------------------------------
+# KEYWORD TABLES (built once at import)
+# Single words are matched against the tokenized text; multi-word or
+# hyphenated phrases are scanned as substrings. Both sides are also
+# plural-folded (_stem), so "cells" / "diagrams" / "processes" still hit
+# singular keywords the way the old substring scan did.
+# ----------------------------------------------------------------------
+_WORD_RE = re.compile(r"[a-z]+")
+
+
+def _stem(word: str) -> str:
+    """Crude plural folding: arteries->artery, processes->process, cells->cell."""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 4 and word.endswith(("sses", "xes", "zes", "ches", "shes")):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def _keywords(words: Set[str]) -> FrozenSet[str]:
+    """Keyword table plus the plural-folded form of each entry."""
+    return frozenset(words) | frozenset(map(_stem, words))
+
+
+def _word_set(text: str) -> Set[str]:
+    """Tokens of `text` plus their plural-folded forms."""
+    words = set(_WORD_RE.findall(text))
+    return words | set(map(_stem, words))
+
+# Obvious STEM / diagram-heavy topics
+_DIAGRAM_TOPIC_WORDS = _keywords({
+    "regression",
+    "algorithm",
+    "statistics",
+    "probability",
+    "function",
+    "equation",
+    "calculus",
+    "derivative",
+    "integral",
+    "matrix",
+    "vector",
+    "physics",
+    "chemistry",
+    "digestive",
+    "stomach",
+    "intestine",
+    "esophagus",
+    "heart",
+    "circulatory",
+    "respiratory",
+    "lungs",
+    "brain",
+    "kidney",
+    "liver",
+    "orbit",
+    "circuit",
+    "transistor",
+    "os",
+})
+_DIAGRAM_TOPIC_PHRASES = (
+    "machine learning",
+    "neural network",
+    "data structure",
+    "graph theory",
+    "nervous system",
+    "solar system",
+    "operating system",
+    "computer architecture",
+)
+
+# Strong technical styles also benefit from diagrams
+_TECHNICAL_STYLE_TAGS = ("technical", "deep_dive")
+
+# Pexels query domain hints: (words, phrases, extra query terms)
+_PEXELS_DOMAIN_HINTS = (
+    (
+        _keywords({"regression", "statistics"}),
+        ("machine learning",),
+        "regression line data chart scatter plot",
+    ),
+    (
+        _keywords({"digestive", "stomach", "intestine", "esophagus", "pancreas", "liver"}),
+        (),
+        "digestive system anatomy medical illustration",
+    ),
+    (
+        _keywords({"heart", "circulatory", "cardio"}),
+        (),
+        "heart anatomy circulatory system medical diagram",
+    ),
+    (
+        _keywords({"brain"}),
+        ("nervous system",),
+        "brain anatomy neuron diagram",
+    ),
+)
+_PEXELS_DEFAULT_HINT = "education diagram illustration"
+
+# Photo alt-text that signals people / classroom / mental-health stock
+_PERSON_WORDS = _keywords({
+    "person",
+    "people",
+    "man",
+    "woman",
+    "boy",
+    "girl",
+    "child",
+    "children",
+    "students",
+    "student",
+    "teacher",
+    "portrait",
+    "face",
+    "selfie",
+    "classroom",
+    "meeting",
+    "team",
+    "adhd",
+    "mental",
+    "psychology",
+    "therapy",
+    "counseling",
+})
+_PERSON_PHRASES = ("class room", "group of people")
+
+# Photo alt-text that signals a diagram / chart / anatomy image
+_PHOTO_DIAGRAM_WORDS = _keywords({
+    "diagram",
+    "graph",
+    "chart",
+    "plot",
+    "equation",
+    "formula",
+    "data",
+    "analytics",
+    "statistics",
+    "regression",
+    "anatomy",
+    "organ",
+    "medical",
+    "biology",
+    "microscope",
+    "infographic",
+    "illustration",
+})
+_PHOTO_DIAGRAM_PHRASES = ("concept map", "x-ray")
+
+_STOP_WORDS = frozenset({
+    "the",
+    "and",
+    "of",
+    "for",
+    "in",
+    "to",
+    "a",
+    "an",
+    "on",
+    "with",
+    "introduction",
+    "overview",
+    "diagram",
+    "illustration",
+    "education",
+    "system",
+    "process",
+})
+
+# Lightweight stand-in for SlideContent in the ad-hoc search helpers
+_DummySlide = namedtuple("_DummySlide", ["title", "image_query", "type"], defaults=[None])
+
+
+def _matches(
+    words: Set[str],
+    text: str,
+    keywords: FrozenSet[str],
+    phrases: Tuple[str, ...] = (),
+) -> bool:
+    """True if any keyword is one of `words` or any phrase occurs in `text`."""
+    return not keywords.isdisjoint(words) or any(p in text for p in phrases)
+
 
 
 class ImageService:
@@ -26,6 +230,8 @@ class ImageService:
         self.api_key = getattr(settings, "PEXELS_API_KEY", None)
         self.base_url = "https://api.pexels.com/v1"
 
+        self._pexels_cache: "OrderedDict[str, List[dict]]" = OrderedDict()
+
         # OpenAI (optional)
         self.openai_api_key = getattr(settings, "OPENAI_API_KEY", None)
         self.openai_image_model = getattr(
@@ -35,18 +241,39 @@ class ImageService:
             settings, "IMAGE_STRATEGY", "hybrid"
         ).lower()  # "hybrid" / "pexels" / "openai"
 
-        self._openai_client = None
-        if OpenAI is not None and self.openai_api_key:
-            try:
-                self._openai_client = OpenAI(api_key=self.openai_api_key)
-            except Exception as e:
-                print(f"[OpenAI] Failed to init image client: {e}")
-                self._openai_client = None
+    # ------------------------------------------------------------------
+    # LAZY CLIENTS (built on first use, not at import)
+    # ------------------------------------------------------------------
+    @cached_property
+    def http(self) -> httpx.AsyncClient:
+        """Shared keep-alive client (HTTP/2) for all Pexels lookups."""
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={"Authorization": self.api_key or ""},
+            http2=True,
+            timeout=PEXELS_TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+        )
+
+    @property
+    def pexels_configured(self) -> bool:
+        return bool(self.api_key) and self.api_key != "your_pexels_api_key_here"
+
+    @cached_property
+    def openai_client(self):
+        """Async OpenAI image client, or None when unavailable / not configured."""
+        if AsyncOpenAI is None or not self.openai_api_key:
+            return None
+        try:
+            return AsyncOpenAI(api_key=self.openai_api_key)
+        except Exception as e:
+            log.warning("[OpenAI] Failed to init image client: %s", e)
+            return None
 
     # ------------------------------------------------------------------
     # PUBLIC HYBRID ENTRY
     # ------------------------------------------------------------------
-    def get_hybrid_image_for_slide(
+    async def get_hybrid_image_for_slide(
         self,
         topic: str,
         slide,
@@ -72,21 +299,40 @@ class ImageService:
                 used_urls.add(url)
             return url
 
-        # Strategy 1: OpenAI diagrams when needed & available
-        if self._openai_client and self.image_strategy in {"hybrid", "openai"}:
-            if needs_diagram:
-                ai_url = self._generate_openai_diagram(
+        use_openai = bool(self.openai_client) and self.image_strategy in {"hybrid", "openai"}
+        use_pexels = self.image_strategy in {"hybrid", "pexels"}
+        pexels_tried = False
+
+        # Strategy 1: OpenAI diagram raced against Pexels; first usable URL wins
+        if use_openai and needs_diagram:
+            candidates = [
+                self._generate_openai_diagram(
                     topic=topic_text,
                     slide_title=title,
                     slide_type=getattr(slide, "type", None),
                     language=lang_val,
                 )
-                if ai_url and ai_url not in used_urls:
-                    return remember(ai_url)
+            ]
+            if use_pexels and self.pexels_configured:
+                pexels_tried = True
+                candidates.append(
+                    self._search_pexels_for_slide(
+                        topic=topic_text,
+                        slide=slide,
+                        slide_index=slide_index,
+                        used_urls=used_urls,
+                    )
+                )
+            first_url = await self._first_result(candidates, IMAGE_RACE_TIMEOUT)
+            if first_url:
+                return remember(first_url)
+            # Nothing usable from the race: give Pexels the sequential try
+            # below (a finished lookup is served from the query cache)
+            pexels_tried = False
 
         # Strategy 2: Pexels (primary in most cases)
-        if self.image_strategy in {"hybrid", "pexels"}:
-            pexels_url = self._search_pexels_for_slide(
+        if use_pexels and not pexels_tried:
+            pexels_url = await self._search_pexels_for_slide(
                 topic=topic_text,
                 slide=slide,
                 slide_index=slide_index,
@@ -96,12 +342,8 @@ class ImageService:
                 return remember(pexels_url)
 
         # Strategy 3: Fallback to OpenAI if we didn't use it yet
-        if (
-            self._openai_client
-            and self.image_strategy in {"hybrid", "openai"}
-            and not needs_diagram
-        ):
-            ai_url = self._generate_openai_diagram(
+        if use_openai and not needs_diagram:
+            ai_url = await self._generate_openai_diagram(
                 topic=topic_text,
                 slide_title=title,
                 slide_type=getattr(slide, "type", None),
@@ -113,67 +355,50 @@ class ImageService:
         # Final fallback: placeholder
         return self._get_placeholder_image(topic_text or title or "education")
 
+    async def _first_result(
+        self,
+        coros: List[Awaitable[Optional[str]]],
+        timeout: float,
+    ) -> Optional[str]:
+        """
+        Run provider lookups concurrently and return the first non-empty URL.
+        Failed lookups are ignored; whatever is still running is cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        pending = {asyncio.ensure_future(c) for c in coros}
+        try:
+            while pending:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if not task.cancelled() and task.exception() is None and task.result():
+                        return task.result()
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+
     # ------------------------------------------------------------------
     # DECISION: does this slide really need a diagram?
     # ------------------------------------------------------------------
     def _needs_diagram(self, topic: str, title: str, style_val: str) -> bool:
         text = f"{topic} {title}".lower()
+        words = _word_set(text)
 
-        # Obvious STEM / diagram-heavy topics
-        diagram_keywords = [
-            "regression",
-            "linear regression",
-            "logistic regression",
-            "machine learning",
-            "neural network",
-            "algorithm",
-            "data structure",
-            "statistics",
-            "probability",
-            "graph theory",
-            "function",
-            "equation",
-            "calculus",
-            "derivative",
-            "integral",
-            "matrix",
-            "vector",
-            "physics",
-            "chemistry",
-            "digestive",
-            "stomach",
-            "intestine",
-            "esophagus",
-            "heart",
-            "circulatory",
-            "respiratory",
-            "lungs",
-            "brain",
-            "nervous system",
-            "kidney",
-            "liver",
-            "orbit",
-            "solar system",
-            "circuit",
-            "transistor",
-            "os",
-            "operating system",
-            "computer architecture",
-        ]
-
-        if any(k in text for k in diagram_keywords):
-            return True
-
-        # Strong technical styles also benefit from diagrams
-        if any(tag in style_val for tag in ["technical", "deep_dive", "technical_deep_dive"]):
+        if _matches(words, text, _DIAGRAM_TOPIC_WORDS, _DIAGRAM_TOPIC_PHRASES):
             return True
 
-        return False
+        return any(tag in style_val for tag in _TECHNICAL_STYLE_TAGS)
 
     # ------------------------------------------------------------------
     # OPENAI IMAGE GENERATION
     # ------------------------------------------------------------------
-    def _generate_openai_diagram(
+    async def _generate_openai_diagram(
         self,
         topic: str,
         slide_title: str,
@@ -184,7 +409,7 @@ class ImageService:
         Generate a simple educational diagram via OpenAI images.
         Returns an image URL if successful.
         """
-        if not self._openai_client:
+        if not self.openai_client:
             return None
 
         base = topic or slide_title or "educational concept"
@@ -211,7 +436,7 @@ class ImageService:
         )
 
         try:
-            result = self._openai_client.images.generate(
+            result = await self.openai_client.images.generate(
                 model=self.openai_image_model,
                 prompt=prompt,
                 size="1024x1024",
@@ -229,13 +454,13 @@ class ImageService:
                 url = getattr(item, "get", lambda *_a, **_k: None)("url")
             return url
         except Exception as e:
-            print(f"[OpenAI] Image generation failed: {e}")
+            log.warning("[OpenAI] Image generation failed: %s", e)
             return None
 
     # ------------------------------------------------------------------
     # PEXELS SEARCH + RANKING
     # ------------------------------------------------------------------
-    def _search_pexels_for_slide(
+    async def _search_pexels_for_slide(
         self,
         topic: str,
         slide,
@@ -247,24 +472,12 @@ class ImageService:
         """
         query = self._build_pexels_query(topic, slide)
 
-        if not self.api_key or self.api_key == "your_pexels_api_key_here":
+        if not self.pexels_configured:
             # No key – fallback to placeholder
             return self._get_placeholder_image(query or topic)
 
         try:
-            url = f"{self.base_url}/search"
-            params = {
-                "query": query,
-                "orientation": "landscape",
-                "per_page": 20,
-            }
-            headers = {"Authorization": self.api_key}
-
-            resp = requests.get(url, params=params, headers=headers, timeout=10)
-            resp.raise_for_status()
-            data = resp.json()
-
-            photos: List[dict] = data.get("photos") or []
+            photos = await self._fetch_pexels(query)
             if not photos:
                 return None
 
@@ -277,9 +490,36 @@ class ImageService:
             )
 
         except Exception as e:
-            print(f"[Pexels] Error for query '{query}': {e}")
+            log.warning("[Pexels] Error for query '%s': %s", query, e)
             return None
 
+    async def _fetch_pexels(self, query: str) -> List[dict]:
+        """
+        Raw Pexels search, memoized per normalized query (LRU).
+        Ranking stays per-slide so `used_urls` de-duplication still applies.
+        """
+        key = query.lower().strip()
+        cached = self._pexels_cache.get(key)
+        if cached is not None:
+            self._pexels_cache.move_to_end(key)
+            return cached
+
+        params = {
+            "query": query,
+            "orientation": "landscape",
+            "per_page": 20,
+        }
+
+        resp = await self.http.get("/search", params=params)
+        resp.raise_for_status()
+        data = resp.json()
+
+        photos: List[dict] = data.get("photos") or []
+        self._pexels_cache[key] = photos
+        if len(self._pexels_cache) > PEXELS_CACHE_SIZE:
+            self._pexels_cache.popitem(last=False)
+        return photos
+
     def _build_pexels_query(self, topic: str, slide) -> str:
         topic = (topic or "").strip()
         title = (slide.title or "").strip()
@@ -291,25 +531,25 @@ class ImageService:
         if topic:
             pieces.append(topic)
 
-        if title and title.lower() not in topic.lower():
+        topic_lower = topic.lower()
+        title_lower = title.lower()
+
+        if title and title_lower not in topic_lower:
             pieces.append(title)
 
-        if base_query and base_query.lower() not in topic.lower():
+        if base_query and base_query.lower() not in topic_lower:
             pieces.append(base_query)
 
-        text = f"{topic} {title}".lower()
+        text = f"{topic_lower} {title_lower}"
+        words = _word_set(text)
 
-        # Domain hints
-        if any(k in text for k in ["regression", "statistics", "machine learning"]):
-            pieces.append("regression line data chart scatter plot")
-        elif any(k in text for k in ["digestive", "stomach", "intestine", "esophagus", "pancreas", "liver"]):
-            pieces.append("digestive system anatomy medical illustration")
-        elif any(k in text for k in ["heart", "circulatory", "cardio"]):
-            pieces.append("heart anatomy circulatory system medical diagram")
-        elif any(k in text for k in ["brain", "nervous system"]):
-            pieces.append("brain anatomy neuron diagram")
+        # Domain hints (first match wins)
+        for hint_words, hint_phrases, hint in _PEXELS_DOMAIN_HINTS:
+            if _matches(words, text, hint_words, hint_phrases):
+                pieces.append(hint)
+                break
         else:
-            pieces.append("education diagram illustration")
+            pieces.append(_PEXELS_DEFAULT_HINT)
 
         return " ".join(pieces).strip()
 
@@ -327,87 +567,44 @@ class ImageService:
         - Avoid people / classroom / ADHD / mental health images.
         - Avoid URLs already used in this deck.
         - Use slide_index to vary choice across slides.
+
+        Single pass: the walk starts at `slide_index` (so ties rotate across
+        slides), keeps only the best candidate seen, and stops as soon as a
+        fresh photo reaches the highest possible score.
+
+        The pick is added to `avoid_urls` before returning: lookups for
+        different slides run concurrently, and reserving here (no await
+        between check and add) keeps two slides from taking the same photo.
         """
 
         if not photos:
             return None
 
-        person_words = [
-            "person",
-            "people",
-            "man",
-            "woman",
-            "boy",
-            "girl",
-            "child",
-            "children",
-            "students",
-            "student",
-            "teacher",
-            "portrait",
-            "face",
-            "selfie",
-            "classroom",
-            "class room",
-            "meeting",
-            "team",
-            "group of people",
-            "adhd",
-            "mental",
-            "psychology",
-            "therapy",
-            "counseling",
-        ]
-
-        diagram_keywords = [
-            "diagram",
-            "graph",
-            "chart",
-            "plot",
-            "equation",
-            "formula",
-            "data",
-            "analytics",
-            "statistics",
-            "regression",
-            "anatomy",
-            "organ",
-            "medical",
-            "biology",
-            "microscope",
-            "infographic",
-            "illustration",
-            "concept map",
-            "x-ray",
-        ]
-
-        def is_persony(alt: str) -> bool:
-            return any(w in alt for w in person_words)
-
-        def has_diagram_word(alt: str) -> bool:
-            return any(w in alt for w in diagram_keywords)
-
-        def has_primary_hint(alt: str) -> bool:
-            return bool(primary_hint) and primary_hint in alt
-
-        def photo_url(photo: dict) -> Optional[str]:
-            src = photo.get("src") or {}
-            return src.get("large") or src.get("medium") or src.get("original")
-
-        scored = []
-        for p in photos:
-            url = photo_url(p)
+        # diagram (+4) + primary hint (+3) + landscape (+1)
+        max_score = 8 if primary_hint else 5
+
+        best_fresh_score, best_fresh_url = None, None
+        best_any_score, best_any_url = None, None
+
+        count = len(photos)
+        start = slide_index % count
+        for k in range(count):
+            p = photos[(start + k) % count]
+
+            src = p.get("src") or {}
+            url = src.get("large") or src.get("medium") or src.get("original")
             if not url:
                 continue
 
             alt = str(p.get("alt", "")).lower()
+            alt_words = _word_set(alt)
 
             score = 0
-            if has_diagram_word(alt):
+            if _matches(alt_words, alt, _PHOTO_DIAGRAM_WORDS, _PHOTO_DIAGRAM_PHRASES):
                 score += 4
-            if has_primary_hint(alt):
+            if primary_hint and primary_hint in alt:
                 score += 3
-            if is_persony(alt):
+            if _matches(alt_words, alt, _PERSON_WORDS, _PERSON_PHRASES):
                 score -= 4
 
             # Small bonus for landscape-ish dimensions if available
@@ -416,83 +613,63 @@ class ImageService:
             if width and height and width > height:
                 score += 1
 
-            scored.append((score, url))
-
-        if not scored:
-            return None
+            if url in avoid_urls:
+                if best_any_score is None or score > best_any_score:
+                    best_any_score, best_any_url = score, url
+                continue
 
-        # Sort by score (best first)
-        scored.sort(key=lambda t: t[0], reverse=True)
+            if score >= max_score:
+                best_fresh_url = url
+                break
+            if best_fresh_score is None or score > best_fresh_score:
+                best_fresh_score, best_fresh_url = score, url
 
-        # Filter out already used URLs if possible
-        fresh = [(s, u) for (s, u) in scored if u not in avoid_urls]
-        if fresh:
-            scored = fresh
+        if best_fresh_url:
+            avoid_urls.add(best_fresh_url)
+            return best_fresh_url
 
-        # Deterministic choice based on slide_index
-        idx = slide_index % len(scored)
-        _, chosen_url = scored[idx]
-        return chosen_url
+        # Fall back to an already-used photo only if nothing fresh is left
+        return best_any_url
 
     # ------------------------------------------------------------------
     # PRIMARY KEYWORD EXTRACTION
     # ------------------------------------------------------------------
     def _extract_primary_keyword(self, text: str) -> Optional[str]:
-        text = (text or "").lower()
-        tokens = [t for t in text.replace("/", " ").split() if t.isalpha()]
-
-        stop = {
-            "the",
-            "and",
-            "of",
-            "for",
-            "in",
-            "to",
-            "a",
-            "an",
-            "on",
-            "with",
-            "introduction",
-            "overview",
-            "diagram",
-            "illustration",
-            "education",
-            "system",
-            "process",
-        }
+        tokens = _WORD_RE.findall((text or "").lower())
 
-        filtered = [t for t in tokens if t not in stop]
+        filtered = [t for t in tokens if t not in _STOP_WORDS]
         if not filtered:
             return None
 
-        filtered.sort(key=len, reverse=True)
-        return filtered[0]
+        # Longest token wins (first one on ties)
+        return max(filtered, key=len)
 
     # ------------------------------------------------------------------
     # MULTI-IMAGE FETCH (still available if needed)
     # ------------------------------------------------------------------
-    def get_multiple_images(
+    async def get_multiple_images(
         self,
         queries: List[str],
         orientation: str = "landscape",
     ) -> List[Optional[str]]:
-        results: List[Optional[str]] = []
-        for q in queries:
-            # Use Pexels search here; hybrid is mainly per-slide
-            url = self.search_image(q, orientation=orientation, per_page=10)
-            results.append(url)
-        return results
+        # Use Pexels search here; hybrid is mainly per-slide.
+        # All lookups run concurrently over the shared connection pool.
+        results = await asyncio.gather(
+            *(self.search_image(q, orientation=orientation, per_page=10) for q in queries),
+            return_exceptions=True,
+        )
+        return [None if isinstance(r, BaseException) else r for r in results]
 
     # Simple direct search if you still need it elsewhere
-    def search_image(
+    async def search_image(
         self,
         query: str,
         orientation: str = "landscape",
         per_page: int = 1,
     ) -> Optional[str]:
-        return self._search_pexels_for_slide(
+        return await self._search_pexels_for_slide(
             topic=query,
-            slide=type("DummySlide", (), {"title": query, "image_query": ""})(),
+            slide=_DummySlide(title=query, image_query=""),
             slide_index=0,
             used_urls=set(),
         )
@@ -505,14 +682,20 @@ class ImageService:
         Deterministic but varied placeholder image using a hash of the query.
         """
         base = (query or "lesson").strip().lower()
-        digest = hashlib.sha256(base.encode("utf-8")).hexdigest()[:8]
+        # Non-cryptographic seed: a 4-byte BLAKE2b digest is plenty
+        digest = hashlib.blake2b(base.encode("utf-8"), digest_size=4).hexdigest()
         seed = f"{base}-{digest}"
-        return f"https://picsum.photos/seed/{seed}/1600/900"
+        return f"{PLACEHOLDER_IMAGE_BASE}{seed}/1600/900"
+
+    @staticmethod
+    def is_placeholder_image(url: Optional[str]) -> bool:
+        """True for URLs produced by _get_placeholder_image."""
+        return bool(url) and url.startswith(PLACEHOLDER_IMAGE_BASE)
 
     # ------------------------------------------------------------------
     # EDUCATIONAL IMAGE HELPER
     # ------------------------------------------------------------------
-    def get_educational_image(
+    async def get_educational_image(
         self,
         topic: str,
         subject: Optional[str] = None,
@@ -524,9 +707,9 @@ class ImageService:
             base = topic
 
         enriched = f"{base} educational diagram illustration"
-        url = self._search_pexels_for_slide(
+        url = await self._search_pexels_for_slide(
             topic=enriched,
-            slide=type("DummySlide", (), {"title": base, "image_query": ""})(),
+            slide=_DummySlide(title=base, image_query=""),
             slide_index=0,
             used_urls=set(),
         )
@@ -536,6 +719,15 @@ class ImageService:
 
         return url
 
+    # ------------------------------------------------------------------
+    # LIFECYCLE
+    # ------------------------------------------------------------------
+    async def aclose(self) -> None:
+        """Close pooled HTTP connections (called on app shutdown)."""
+        # Only close the client if it was ever created
+        if "http" in self.__dict__:
+            await self.http.aclose()
+
 
 # Singleton instance
 image_service = ImageService()
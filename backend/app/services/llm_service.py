@@ -1,9 +1,19 @@
-import json
-from typing import List, Dict, Any
-
-from groq import Groq
-
-from app.core.config import settings
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import cached_property
+from typing import AsyncIterator, Iterator, List, Dict, Any, Optional, Tuple
+
+import orjson
+from groq import AsyncGroq
+from pydantic import TypeAdapter
+
+from app.core.config import settings, PRESENTATIONS_DIR
 from app.models.schemas import (
     PresentationRequest,
     SlideContent,
@@ -13,251 +23,637 @@ from app.models.schemas import (
     Language,
 )
 
+# Semantic matching is optional – the cache still serves exact hits without it
+try:
+    import numpy as np  # type: ignore
+    from sentence_transformers import SentenceTransformer  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+    SentenceTransformer = None
+
+# flock keeps API workers from clobbering each other's cache writes (POSIX only)
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+log = logging.getLogger("eduslide.llm")
+
+# Validates a whole list of slide dicts in one core-schema call
+_SLIDES_ADAPTER = TypeAdapter(List[SlideContent])
+
+_SYSTEM_PROMPT = "You are an expert teacher who designs clear, structured slide decks for students."
+
+# ---------------------------------------------------------------------------
+# GENERATION PROMPT (static parts built once at import)
+# ---------------------------------------------------------------------------
+_AUDIENCE_MAP = {
+    AudienceLevel.ELEMENTARY: "children studying in grades 1–5",
+    AudienceLevel.MIDDLE: "students in grades 6–8",
+    AudienceLevel.HIGH: "class 9–12 students",
+    AudienceLevel.COLLEGE: "undergraduate learners",
+    AudienceLevel.PROFESSIONAL: "industry professionals",
+}
+
+_STYLE_MAP = {
+    PresentationStyle.ACADEMIC: "structured, clear, textbook-oriented",
+    PresentationStyle.STORYTELLING: "narrative with relatable scenarios and examples",
+    PresentationStyle.INTERACTIVE: "engaging, question-based, activity-driven",
+    PresentationStyle.TECHNICAL: "precise, systematic, process-focused",
+    PresentationStyle.VISUAL: "minimal text, diagram-friendly, visual-oriented",
+}
+
+_QUIZ_LINES = {
+    True: "include a quiz slide",
+    False: "add a quiz slide only if meaningful",
+}
+
+_NOTES_LINES = {
+    True: '- "n": speaker notes, 2–3 sentences.',
+    False: '- Omit "n" (no speaker notes).',
+}
+
+# Output uses one-letter keys to cut output tokens (and so latency):
+# t=type, h=heading (title), c=content bullets, q=image query, n=speaker
+# notes. Title is "h", not "T": a key differing from "t" only by case is
+# easy for the model to mix up. _make_slide maps them back and still
+# accepts "T" and the long names.
+# One object per line lets the stream scanner emit slides early. Groq's
+# JSON mode (response_format) can't be combined with streaming, so the
+# scanner is what guarantees parseable objects.
+_NDJSON_OUTPUT_FORMAT = """Return ONLY newline-delimited JSON, one slide object per line, no array, no fences:
+{"t":"content","h":"...","c":["b1","b2"],"q":"...","n":"..."}"""
+
+# Indentation/trailing whitespace is stripped once here: it is pure
+# input-token overhead
+_PROMPT_TEMPLATE = "\n".join(
+    line.strip()
+    for line in """
+You are an expert educator who designs high-quality presentation slides.
 
-class LLMService:
-    """
-    Service for interacting with Groq to generate
-    high-quality, structured slide content.
-    """
-
-    def __init__(self):
-        self.client = Groq(api_key=settings.GROQ_API_KEY)
-        self.model = settings.GROQ_MODEL
-        print(">>> USING GROQ MODEL:", settings.GROQ_MODEL)
+TASK:
+Generate EXACTLY {num_slides} slides about: "{topic}"
 
-    # ---------------------------
-    # PUBLIC: main entry point
-    # ---------------------------
-    def generate_slide_content(
-        self, request: PresentationRequest
-    ) -> List[SlideContent]:
-        prompt = self._build_generation_prompt(request)
+REQUIREMENTS:
+- Write all content in {language}.
+- Use a {style_desc} style.
+- Start with a title slide, end with a summary slide; {quiz_line}.
+- "t" is one of: "title", "content", "summary", "quiz", "image_heavy".
+- "h": the slide's own title (every slide needs one).
+- "c": 4–6 rich, explanatory, teaching-oriented bullet points (not short phrases).
+- "q": one relevant short English image search query.
+{notes_line}
 
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "You are an expert teacher and presentation designer. "
-                            "You create clear, structured, engaging slide decks for students."
-                        ),
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt,
-                    },
-                ],
-                temperature=0.6,
-                max_tokens=3500,
-            )
+FORMAT (VERY IMPORTANT):
+{output_format}
 
-            raw_text = response.choices[0].message.content
-            slides_dict = self._extract_and_parse_json(raw_text)
+Make the content deeply informative, well-structured, and age-appropriate for {audience_desc}.
+""".strip().splitlines()
+)
 
-            if not slides_dict:
-                return self._generate_template_slides(request)
+# Output budget per slide. A slide as prompted is ~12 tokens of title,
+# 4–6 explanatory bullets at ~30 each, a ~10-token query, 2–3 sentences
+# of notes (~60) and ~25 of JSON keys/punctuation: ~290 typical, ~350 for
+# a six-bullet slide with notes. 400 leaves headroom over that worst case;
+# the cap covers the largest allowed deck (15 slides).
+SLIDE_OUTPUT_TOKENS = 400
+MAX_OUTPUT_TOKENS = 15 * SLIDE_OUTPUT_TOKENS
 
-            return self._parse_slides(slides_dict, request)
 
-        except Exception as e:
-            print(f"Error in generate_slide_content: {e}")
-            return self._generate_template_slides(request)
+def _output_budget(num_slides: int) -> int:
+    return min(MAX_OUTPUT_TOKENS, SLIDE_OUTPUT_TOKENS * num_slides)
 
-    # ---------------------------
-    # NEW IMPROVED PROMPT
-    # ---------------------------
-    def _build_generation_prompt(self, request: PresentationRequest) -> str:
+# Prompt-response cache settings
+SEMANTIC_CACHE_PATH = os.path.join(PRESENTATIONS_DIR, ".cache.jsonl")
+SEMANTIC_CACHE_MODEL = "all-MiniLM-L6-v2"
+SEMANTIC_CACHE_THRESHOLD = 0.92
+# LRU cap: a deck is a few KB of slides plus a 384-float embedding
+SEMANTIC_CACHE_MAX_ENTRIES = 500
+# Don't compact a log smaller than this, however small the live set is
+SEMANTIC_CACHE_COMPACT_MIN_BYTES = 1 << 20
+_LOG_LINE_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE
 
-        audience_map = {
-            AudienceLevel.ELEMENTARY: "children studying in grades 1–5",
-            AudienceLevel.MIDDLE: "students in grades 6–8",
-            AudienceLevel.HIGH: "class 9–12 students",
-            AudienceLevel.COLLEGE: "undergraduate learners",
-            AudienceLevel.PROFESSIONAL: "industry professionals",
-        }
 
-        style_map = {
-            PresentationStyle.ACADEMIC: "structured, clear, textbook-oriented",
-            PresentationStyle.STORYTELLING: "narrative with relatable scenarios and examples",
-            PresentationStyle.INTERACTIVE: "engaging, question-based, activity-driven",
-            PresentationStyle.TECHNICAL: "precise, systematic, process-focused",
-            PresentationStyle.VISUAL: "minimal text, diagram-friendly, visual-oriented",
-        }
+class _SemanticCache:
+    """
+    Prompt-response cache for generated slides.
 
-        audience_desc = audience_map.get(request.audience_level, "students")
-        style_desc = style_map.get(request.presentation_style, "clear and structured")
+    - Exact hit: sha256 over every request field that shapes the LLM output.
+    - Near hit: cosine similarity of topic embeddings, compared only against
+      entries whose other fields (audience, style, language, ...) match.
 
-        language = request.language.value
-        num_slides = request.num_slides
-        include_quiz = request.include_quiz
+    Slides are stored as plain dicts, so each hit returns fresh SlideContent
+    objects that callers are free to mutate. Holds at most `max_entries`
+    decks, evicting the least recently used. Persisted as an append-only
+    JSON-lines log (one line per put, replayed on load) shared by all API
+    workers, compacted to the live entries once it doubles in size.
+    """
 
-        prompt = f"""
-You are an expert educator who designs high-quality presentation slides.
+    def __init__(self, path: str, threshold: float, max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES) -> None:
+        self._path = path
+        self._threshold = threshold
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        # key -> {"k": key, "b": bucket, "s": slide dicts, "e": embedding or None}
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # bucket -> (entry keys, normalized embedding matrix)
+        self._index: Dict[Tuple[Any, ...], Tuple[List[str], Any]] = {}
+        # Log size after the last load/compaction; appends compact at 2x
+        self._compacted_size = 0
+        self._load()
 
-TASK:
-Generate EXACTLY {num_slides} slides about: "{request.topic}"
+    # ---------------------------
+    # KEYS + EMBEDDINGS
+    # ---------------------------
+    @staticmethod
+    def _normalize_topic(topic: str) -> str:
+        return " ".join((topic or "").lower().split())
+
+    @staticmethod
+    def _bucket(request: PresentationRequest) -> Tuple[Any, ...]:
+        return (
+            request.audience_level.value,
+            request.presentation_style.value,
+            request.language.value,
+            request.num_slides,
+            request.include_quiz,
+            request.speaker_notes,
+        )
 
-REQUIREMENTS:
-- Write all content in {language}.
-- Each slide must have **4–6 rich bullet points** (not short phrases).
-- Bullets must be explanatory, clear, and teaching-oriented.
-- Every slide must include one relevant short English "image_query".
-- Speaker notes must be 2–3 sentences if requested.
-
-SLIDE STRUCTURE:
-1. TITLE slide  
-2. Overview / introduction  
-3. Core concept slides  
-4. Real-world examples / applications  
-5. {"Quiz slide" if include_quiz else "Optional quiz slide only if meaningful"}  
-6. Summary slide
-
-ALLOWED SLIDE TYPES:
-"title", "content", "summary", "quiz", "image_heavy"
+    def _key(self, request: PresentationRequest) -> str:
+        parts = [self._normalize_topic(request.topic), *map(str, self._bucket(request))]
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
 
-FORMAT (VERY IMPORTANT):
-Return ONLY this JSON (no markdown fences):
-
-{{
-  "slides": [
-    {{
-      "type": "content",
-      "title": "...",
-      "subtitle": null,
-      "content": ["bullet 1", "bullet 2", "bullet 3", "bullet 4"],
-      "image_query": "educational photo of ...",
-      "speaker_notes": "2–3 sentence explanation."
-    }}
-  ]
-}}
+    @cached_property
+    def _model(self):
+        """Embedding model, loaded once on first near-hit lookup."""
+        if SentenceTransformer is None:
+            return None
+        try:
+            return SentenceTransformer(SEMANTIC_CACHE_MODEL)
+        except Exception as e:
+            log.warning("Semantic cache disabled, could not load %s: %s", SEMANTIC_CACHE_MODEL, e)
+            return None
 
-Make the content deeply informative, well-structured, and age-appropriate for {audience_desc}.
-"""
-        return prompt.strip()
+    def _embed(self, request: PresentationRequest):
+        if self._model is None:
+            return None
+        text = self._normalize_topic(request.topic)
+        return self._model.encode(text, normalize_embeddings=True).astype(np.float32)
 
     # ---------------------------
-    # JSON HANDLING
+    # LOOKUP / INSERT
     # ---------------------------
-    def _extract_and_parse_json(self, text: str) -> Dict[str, Any] | None:
-        if not text:
+    def get(self, request: PresentationRequest) -> Optional[List[SlideContent]]:
+        key = self._key(request)
+        with self._lock:
+            stored = self._touch(key)
+        if stored is None:
+            stored = self._nearest(request)
+        if stored is None:
             return None
+        return _SLIDES_ADAPTER.validate_python(stored)
 
-        if "```" in text:
-            parts = text.split("```")
-            candidate = None
-            for part in parts:
-                if "{" in part:
-                    candidate = part
-                    break
-            text = candidate or text
+    def _nearest(self, request: PresentationRequest) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            keys, matrix = self._index.get(self._bucket(request), ([], None))
+        if matrix is None:
+            return None
 
-        text = text.strip()
-        if text.lower().startswith("json"):
-            text = text[4:].strip()
+        emb = self._embed(request)
+        if emb is None:
+            return None
 
-        start = text.find("{")
-        end = text.rfind("}")
+        # Rows are unit vectors, so one mat-vec product gives every cosine
+        sims = matrix @ emb
+        best = int(sims.argmax())
+        if sims[best] < self._threshold:
+            return None
+        with self._lock:
+            return self._touch(keys[best])
 
-        if start == -1 or end == -1 or end <= start:
+    def _touch(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Slides for `key`, marked most recently used. Caller holds the lock."""
+        record = self._entries.get(key)
+        if record is None:
             return None
+        self._entries.move_to_end(key)
+        return record["s"]
+
+    def put(self, request: PresentationRequest, slides: List[SlideContent]) -> None:
+        key = self._key(request)
+        emb = self._embed(request)
+        record = {
+            "k": key,
+            "b": list(self._bucket(request)),
+            "s": [s.model_dump(mode="json") for s in slides],
+            "e": emb,
+        }
+
+        with self._lock:
+            old = self._entries.get(key)
+            if old is not None:
+                # Same request again: keep the embedding row already indexed
+                record["e"] = old["e"]
+            self._insert(record)
+            self._append(record)
+
+    def _insert(self, record: Dict[str, Any]) -> None:
+        """Add or replace an entry and evict past the cap. Caller holds the lock."""
+        key = record["k"]
+        is_new = key not in self._entries
+        self._entries[key] = record
+        self._entries.move_to_end(key)
+        if is_new and record["e"] is not None and np is not None:
+            bucket = tuple(record["b"])
+            keys, matrix = self._index.get(bucket, ([], None))
+            emb = np.asarray(record["e"], dtype=np.float32)
+            matrix = emb[None, :] if matrix is None else np.vstack([matrix, emb])
+            self._index[bucket] = (keys + [key], matrix)
+
+        while len(self._entries) > self._max_entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._unindex(evicted)
+
+    def _unindex(self, record: Dict[str, Any]) -> None:
+        bucket = tuple(record["b"])
+        keys, matrix = self._index.get(bucket, ([], None))
+        if matrix is None or record["k"] not in keys:
+            return
+        row = keys.index(record["k"])
+        if len(keys) == 1:
+            del self._index[bucket]
+        else:
+            self._index[bucket] = (keys[:row] + keys[row + 1:], np.delete(matrix, row, axis=0))
 
-        json_str = text[start: end + 1]
+    # ---------------------------
+    # PERSISTENCE
+    # ---------------------------
+    # The log is shared by every API worker process: appends and compaction
+    # run under an exclusive flock on a sidecar lock file (the log itself is
+    # swapped out by os.replace, so it can't carry the lock).
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        if fcntl is None:
+            # No flock (Windows): compaction still merges the on-disk log
+            yield
+            return
+        with open(f"{self._path}.lock", "ab") as lock_fh:
+            fcntl.flock(lock_fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_fh, fcntl.LOCK_UN)
+
+    def _read_log(self) -> List[Dict[str, Any]]:
+        """Every record in the log, in write order. Caller holds the file lock."""
+        try:
+            with open(self._path, "rb") as fh:
+                lines = fh.read().splitlines()
+        except FileNotFoundError:
+            return []
 
+        records = []
+        for line in lines:
+            try:
+                record = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                # A put cut short by a crash leaves a torn final line
+                log.warning("Skipping corrupt LLM cache line in %s", self._path)
+                continue
+            if isinstance(record, dict) and {"k", "b", "s"} <= record.keys():
+                record.setdefault("e", None)
+                records.append(record)
+        return records
+
+    def _load(self) -> None:
         try:
-            return json.loads(json_str)
+            with self._file_lock():
+                records = self._read_log()
+                self._compacted_size = os.path.getsize(self._path) if records else 0
         except Exception as e:
-            print(f"JSON parse error: {e}")
-            print("RAW TEXT:", text[:400])
-            return None
+            log.warning("Ignoring unreadable LLM cache at %s: %s", self._path, e)
+            return
+        # Replay in write order; later lines replace earlier ones for a key
+        self._reset(records)
+
+    def _reset(self, records) -> None:
+        """Rebuild entries and index from records, oldest first. Caller holds the lock."""
+        self._entries.clear()
+        self._index.clear()
+        for record in records:
+            self._insert(record)
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        """Persist one put; compact once the log doubles. Caller holds the lock."""
+        try:
+            with self._file_lock():
+                with open(self._path, "ab") as fh:
+                    fh.write(orjson.dumps(record, option=_LOG_LINE_OPTIONS))
+                    size = fh.tell()
+                if size > 2 * max(self._compacted_size, SEMANTIC_CACHE_COMPACT_MIN_BYTES):
+                    self._compact()
+        except Exception as e:
+            log.warning("Could not persist LLM cache: %s", e)
+
+    def _compact(self) -> None:
+        """
+        Rewrite the log as one line per live entry. Re-reads it first so
+        lines appended by other workers survive; this process's entries go
+        last, keeping its recency order. Caller holds both locks.
+        """
+        merged: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        for record in self._read_log():
+            merged[record["k"]] = record
+        for key, record in self._entries.items():
+            merged[key] = record
+            merged.move_to_end(key)
+        self._reset(merged.values())
+
+        # Unique tmp name: never share a half-written file with another writer
+        tmp_path = f"{self._path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "wb") as fh:
+                for record in self._entries.values():
+                    fh.write(orjson.dumps(record, option=_LOG_LINE_OPTIONS))
+                size = fh.tell()
+            os.replace(tmp_path, self._path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        self._compacted_size = size
+
+
+def _raw_slides(data: Dict[str, Any]) -> Optional[List[Any]]:
+    """The slide list from a parsed reply ({"s": [...]} or legacy {"slides": [...]})."""
+    raw = data.get("s", data.get("slides"))
+    return raw if isinstance(raw, list) else None
+
+
+class _SlideStreamScanner:
+    """
+    Incremental scanner over streamed model text.
+
+    Tracks brace depth and JSON string state across chunks and returns each
+    top-level `{...}` object as soon as its closing brace arrives. Only the
+    unfinished object is kept buffered.
+    """
+
+    def __init__(self) -> None:
+        self._buf: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        objects: List[Dict[str, Any]] = []
+        start = 0 if self._depth else -1
+
+        for i, ch in enumerate(text):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                if self._depth:
+                    self._in_string = True
+            elif ch == "{":
+                if self._depth == 0:
+                    start = i
+                self._depth += 1
+            elif ch == "}" and self._depth:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._buf.append(text[start: i + 1])
+                    raw = "".join(self._buf)
+                    self._buf.clear()
+                    start = -1
+                    try:
+                        obj = orjson.loads(raw)
+                    except orjson.JSONDecodeError as e:
+                        log.warning("Skipping unparsable streamed object: %s; raw: %.200s", e, raw)
+                        continue
+                    if isinstance(obj, dict):
+                        objects.append(obj)
+
+        if self._depth and start != -1:
+            self._buf.append(text[start:])
+        return objects
+
+
+class StreamOutcome:
+    """
+    How a streamed deck was produced; filled in by astream_slide_content
+    once the stream ends, for callers that cache finished decks.
+    """
+
+    def __init__(self) -> None:
+        self.from_model = False  # slides came from the LLM (or its cache), not templates
+        self.complete = False    # stream ended cleanly with every requested slide
+
+
+class LLMService:
+    """
+    Service for interacting with Groq to generate
+    high-quality, structured slide content.
+    """
+
+    def __init__(self):
+        self.aclient = AsyncGroq(api_key=settings.GROQ_API_KEY)
+        self.model = settings.GROQ_MODEL
+        self.cache = _SemanticCache(SEMANTIC_CACHE_PATH, SEMANTIC_CACHE_THRESHOLD)
+        log.info("Using Groq model: %s", settings.GROQ_MODEL)
 
     # ---------------------------
-    # SLIDE PARSING
+    # PUBLIC: main entry point
     # ---------------------------
-    def _parse_slides(
-        self, slides_data: Dict[str, Any], request: PresentationRequest
-    ) -> List[SlideContent]:
+    async def astream_slide_content(
+        self,
+        request: PresentationRequest,
+        outcome: Optional[StreamOutcome] = None,
+    ) -> AsyncIterator[SlideContent]:
+        """
+        Stream the completion and yield each slide as soon as its JSON object
+        closes, so callers can start image lookups while generation continues.
+        Falls back to template slides if nothing usable was streamed.
+
+        A deck cut short (stream error, or fewer slides than requested) is
+        still returned, since its slides have already been yielded, but it
+        is logged and never cached. `outcome`, if given, records which case
+        happened.
+        """
+        if outcome is None:
+            outcome = StreamOutcome()
+
+        cached = await asyncio.to_thread(self.cache.get, request)
+        if cached is not None:
+            # Only complete model decks are ever cached
+            outcome.from_model = outcome.complete = True
+            for slide in cached:
+                yield slide
+            return
+
+        emitted: List[SlideContent] = []
+        scanner = _SlideStreamScanner()
+        completed = False
+        truncated = False
 
-        raw_slides = slides_data.get("slides", [])
-        slides: List[SlideContent] = []
+        try:
+            stream = await self.aclient.chat.completions.create(
+                **self._completion_kwargs(request), stream=True
+            )
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                if chunk.choices[0].finish_reason == "length":
+                    # Budget too small for this deck: the last slide is cut
+                    # off, so the result must not count as complete
+                    truncated = True
+                    log.error(
+                        "Completion for '%s' hit max_tokens=%d after %d slides",
+                        request.topic, _output_budget(request.num_slides), len(emitted),
+                    )
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                for obj in scanner.feed(delta):
+                    # Tolerate a model that still wraps everything in {"s": [...]}
+                    raw_slides = _raw_slides(obj)
+                    if raw_slides is None:
+                        raw_slides = [obj]
+                    for slide_data in raw_slides:
+                        if not isinstance(slide_data, dict):
+                            continue
+                        slide = SlideContent.model_validate(self._make_slide(slide_data, request))
+                        emitted.append(slide)
+                        yield slide
+            completed = not truncated
 
-        if not isinstance(raw_slides, list):
-            return self._generate_template_slides(request)
+        except Exception as e:
+            log.warning("Error in astream_slide_content after %d slides: %s", len(emitted), e)
+
+        if not emitted:
+            for slide in self._generate_template_slides(request):
+                yield slide
+            return
+
+        outcome.from_model = True
+        outcome.complete = completed and len(emitted) == request.num_slides
+        if not outcome.complete:
+            log.warning(
+                "Incomplete deck for '%s': %d of %d slides; not caching",
+                request.topic, len(emitted), request.num_slides,
+            )
+            return
 
-        for slide_data in raw_slides:
+        await asyncio.to_thread(self.cache.put, request, emitted)
 
-            slide_type_str = str(slide_data.get("type", "content")).lower()
-            try:
-                slide_type = SlideType(slide_type_str)
-            except:
-                slide_type = SlideType.CONTENT
-
-            content_list = []
-            content = slide_data.get("content", [])
-
-            if isinstance(content, str):
-                content_list = [content]
-            elif isinstance(content, list):
-                content_list = [str(item) for item in content if item]
-
-            notes = slide_data.get("speaker_notes")
-            if not request.speaker_notes:
-                notes = None
-
-            slides.append(
-                SlideContent(
-                    type=slide_type,
-                    title=str(slide_data.get("title", request.topic)),
-                    subtitle=slide_data.get("subtitle"),
-                    content=content_list,
-                    image_query=slide_data.get("image_query") or request.topic,
-                    image_url=None,
-                    speaker_notes=notes,
-                    layout="default",
-                )
-            )
+    # ---------------------------
+    # SHARED REQUEST / RESPONSE HELPERS
+    # ---------------------------
+    def _completion_kwargs(self, request: PresentationRequest) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": _SYSTEM_PROMPT},
+                {
+                    "role": "user",
+                    "content": self._build_generation_prompt(request),
+                },
+            ],
+            "temperature": 0.6,
+            "max_tokens": _output_budget(request.num_slides),
+        }
 
-        return slides
+    # ---------------------------
+    # NEW IMPROVED PROMPT
+    # ---------------------------
+    def _build_generation_prompt(self, request: PresentationRequest) -> str:
+        return _PROMPT_TEMPLATE.format_map(
+            {
+                "num_slides": request.num_slides,
+                "topic": request.topic,
+                "language": request.language.value,
+                "style_desc": _STYLE_MAP.get(request.presentation_style, "clear and structured"),
+                "audience_desc": _AUDIENCE_MAP.get(request.audience_level, "students"),
+                "quiz_line": _QUIZ_LINES[request.include_quiz],
+                "notes_line": _NOTES_LINES[request.speaker_notes],
+                "output_format": _NDJSON_OUTPUT_FORMAT,
+            }
+        )
+
+    # ---------------------------
+    # SLIDE PARSING
+    # ---------------------------
+    def _make_slide(
+        self, slide_data: Dict[str, Any], request: PresentationRequest
+    ) -> Dict[str, Any]:
+        """
+        Normalize one raw model slide into SlideContent fields.
+        Accepts the compact keys from the prompt and the legacy long names.
+        """
+        slide_type_str = str(slide_data.get("t") or slide_data.get("type") or "content").lower()
+        try:
+            slide_type = SlideType(slide_type_str)
+        except:
+            slide_type = SlideType.CONTENT
+
+        content = slide_data.get("c", slide_data.get("content", []))
+        if isinstance(content, list):
+            content_list = [item if isinstance(item, str) else str(item) for item in content if item]
+        else:
+            content_list = [content] if isinstance(content, str) else []
+
+        notes = slide_data.get("n") or slide_data.get("speaker_notes")
+        if not request.speaker_notes:
+            notes = None
+
+        return {
+            "type": slide_type,
+            "title": str(
+                slide_data.get("h") or slide_data.get("T") or slide_data.get("title") or request.topic
+            ),
+            "subtitle": slide_data.get("subtitle"),
+            "content": content_list,
+            "image_query": slide_data.get("q") or slide_data.get("image_query") or request.topic,
+            "image_url": None,
+            "speaker_notes": notes,
+            "layout": "default",
+        }
 
     # ---------------------------
     # SIMPLE TEMPLATE FALLBACK
     # ---------------------------
     def _generate_template_slides(self, request: PresentationRequest) -> List[SlideContent]:
+        topic = request.topic
+        base = {
+            "subtitle": None,
+            "image_query": topic,
+            "image_url": None,
+            "speaker_notes": None,
+            "layout": "default",
+        }
 
-        slides: List[SlideContent] = []
-
-        slides.append(
+        slides = [SlideContent(type=SlideType.TITLE, title=topic, content=[], **base)]
+        slides.extend(
             SlideContent(
-                type=SlideType.TITLE,
-                title=request.topic,
-                subtitle=None,
-                content=[],
-                image_query=request.topic,
-                image_url=None,
-                speaker_notes=None,
-                layout="default",
+                type=SlideType.CONTENT,
+                title=f"{topic} – Key Idea {i}",
+                content=[
+                    f"Important concept {i}",
+                    f"Explanation {i}",
+                    f"Example {i}",
+                ],
+                **base,
             )
+            for i in range(1, request.num_slides)
         )
-
-        for i in range(1, request.num_slides):
-            slides.append(
-                SlideContent(
-                    type=SlideType.CONTENT,
-                    title=f"{request.topic} – Key Idea {i}",
-                    subtitle=None,
-                    content=[
-                        f"Important concept {i}",
-                        f"Explanation {i}",
-                        f"Example {i}",
-                    ],
-                    image_query=request.topic,
-                    image_url=None,
-                    speaker_notes=None,
-                    layout="default",
-                )
-            )
-
         return slides
 
 
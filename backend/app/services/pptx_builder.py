@@ -0,0 +1,354 @@
+"""
+PPTX rendering (themes, layout, bullet safety).
+
+Kept free of service singletons: pool workers are spawned, so they import
+only this module (python-pptx + the schemas), not the LLM/image services.
+"""
+import copy
+import io
+import logging
+import re
+from functools import lru_cache
+from typing import BinaryIO, Dict, List, Optional, Union
+
+from pptx import Presentation
+from pptx.util import Inches, Pt
+from pptx.dml.color import RGBColor
+
+from app.models.schemas import (
+    PresentationRequest,
+    SlideContent,
+    SlideType,
+    Language,
+    PresentationStyle,
+)
+
+log = logging.getLogger("eduslide.pptx")
+
+# Write buffer for saving PPTX files (1 MiB)
+PPTX_WRITE_BUFFER = 1 << 20
+
+# Characters that are invalid in raw XML text (tab is fine)
+_CONTROL_CHARS_RE = re.compile(r"[\x00-\x08\x0a-\x1f]")
+
+
+# ---------------------------------------------------------------------------
+# THEMES (built once; RGBColor is immutable, so sharing is safe)
+# ---------------------------------------------------------------------------
+# Default "clean light" theme
+_DEFAULT_THEME = {
+    "bg": RGBColor(245, 246, 250),
+    "title_color": RGBColor(20, 20, 20),
+    "body_color": RGBColor(30, 30, 30),
+    "accent": RGBColor(52, 120, 246),      # blue
+    "subtitle_color": RGBColor(90, 90, 90),
+}
+
+_THEMES: Dict[PresentationStyle, dict] = {
+    PresentationStyle.ACADEMIC: {
+        "bg": RGBColor(250, 252, 255),
+        "title_color": RGBColor(15, 40, 80),
+        "body_color": RGBColor(35, 35, 45),
+        "accent": RGBColor(52, 84, 209),    # academic blue
+        "subtitle_color": RGBColor(70, 80, 110),
+    },
+    PresentationStyle.STORYTELLING: {
+        "bg": RGBColor(255, 251, 245),
+        "title_color": RGBColor(80, 40, 20),
+        "body_color": RGBColor(55, 45, 40),
+        "accent": RGBColor(230, 126, 34),   # warm orange
+        "subtitle_color": RGBColor(120, 90, 70),
+    },
+    PresentationStyle.VISUAL: {
+        "bg": RGBColor(245, 248, 255),
+        "title_color": RGBColor(25, 25, 35),
+        "body_color": RGBColor(40, 40, 50),
+        "accent": RGBColor(46, 204, 113),   # green accent
+        "subtitle_color": RGBColor(90, 100, 120),
+    },
+    PresentationStyle.TECHNICAL: {
+        "bg": RGBColor(20, 24, 31),
+        "title_color": RGBColor(236, 240, 241),
+        "body_color": RGBColor(221, 230, 234),
+        "accent": RGBColor(52, 152, 219),   # tech blue
+        "subtitle_color": RGBColor(171, 178, 185),
+    },
+}
+
+
+# ---------------------------------------------------------------------------
+# TEXT TRUNCATION
+# ---------------------------------------------------------------------------
+@lru_cache(maxsize=None)
+def _truncate_re(limit: int) -> re.Pattern:
+    # Longest prefix of at most limit-1 chars that is followed by a space,
+    # i.e. everything before the last space within the first `limit` chars
+    return re.compile(r"^(.{0,%d}) " % (limit - 1), re.DOTALL)
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Cut `text` to `limit` chars at a word boundary and add an ellipsis."""
+    if len(text) <= limit:
+        return text
+    m = _truncate_re(limit).match(text)
+    return (m.group(1) if m else text[:limit]) + "..."
+
+
+# ---------------------------------------------------------------------------
+# LAYOUT GEOMETRY (Emu lengths built once, not per slide)
+# ---------------------------------------------------------------------------
+_SLIDE_W, _SLIDE_H = Inches(13.33), Inches(7.5)
+_TITLE_LEFT, _TITLE_TOP, _TITLE_W, _TITLE_H = Inches(0.6), Inches(0.3), Inches(11.8), Inches(1.0)
+_ACCENT_LEFT, _ACCENT_TOP, _ACCENT_W, _ACCENT_H = Inches(0.6), Inches(1.25), Inches(2.5), Inches(0.08)
+
+# Text block: fixed left/width; (top, height) depends on the slide
+_TEXT_LEFT, _TEXT_W = Inches(0.8), Inches(6.1)
+_TEXT_TITLE_ONLY = (Inches(2.3), Inches(3.5))
+_TEXT_SHORT = (Inches(2.1), Inches(3.8))
+_TEXT_LONG = (Inches(1.5), Inches(5.1))
+
+_IMG_LEFT, _IMG_TOP, _IMG_MAX_W, _IMG_MAX_H = Inches(7.2), Inches(1.7), Inches(5.6), Inches(5.0)
+
+_PT_34, _PT_18, _PT_16, _PT_4, _PT_1 = Pt(34), Pt(18), Pt(16), Pt(4), Pt(1)
+
+
+# ---------------------------------------------------------------------------
+# THEME SELECTION  (no external .pptx files needed)
+# ---------------------------------------------------------------------------
+def theme_for_request(request: PresentationRequest) -> dict:
+    """
+    Return a simple theme config (colors + sizing tweaks)
+    based on the selected PresentationStyle.
+    """
+    return _THEMES.get(request.presentation_style, _DEFAULT_THEME)
+
+
+# ---------------------------------------------------------------------------
+# BUILD
+# ---------------------------------------------------------------------------
+def build_pptx_bytes(
+    request: PresentationRequest,
+    slides: List[SlideContent],
+    images: Optional[Dict[str, io.BytesIO]] = None,
+) -> bytes:
+    """Build the deck into memory and return the .pptx bytes."""
+    buffer = io.BytesIO()
+    build_pptx(buffer, request, slides, images)
+    return buffer.getvalue()
+
+
+def build_pptx(
+    file_or_stream: Union[str, BinaryIO],
+    request: PresentationRequest,
+    slides: List[SlideContent],
+    images: Optional[Dict[str, io.BytesIO]] = None,
+) -> None:
+    """
+    Builds the .pptx file with:
+    - 16:9 widescreen size
+    - Themed background + colors
+    - Title at the top
+    - Bullet text on the left (overflow-safe)
+    - Image on the right (scaled + centered)
+    """
+
+    prs = Presentation()
+
+    # Force 16:9 widescreen so width isn't tiny
+    prs.slide_width = _SLIDE_W
+    prs.slide_height = _SLIDE_H
+
+    theme = theme_for_request(request)
+    is_dark = request.presentation_style == PresentationStyle.TECHNICAL
+    is_bilingual = request.language == Language.BILINGUAL
+
+    # Text sizing rules
+    if is_bilingual:
+        max_bullets = 4
+        max_chars_per_bullet = 160
+        bullet_font_size = _PT_16
+    else:
+        max_bullets = 5
+        max_chars_per_bullet = 200
+        bullet_font_size = _PT_18
+
+    # Images are downloaded up front by _aprefetch_images; without
+    # them the deck is built text-only
+    if images is None:
+        images = {}
+
+    for slide_index, slide_data in enumerate(slides):
+        layout = prs.slide_layouts[6]  # blank slide
+        slide = prs.slides.add_slide(layout)
+
+        # -------------------------------
+        # BACKGROUND COLOR (theme)
+        # -------------------------------
+        fill = slide.background.fill
+        fill.solid()
+        fill.fore_color.rgb = theme["bg"]
+
+        # -------------------------------
+        # TITLE
+        # -------------------------------
+        title_box = slide.shapes.add_textbox(
+            _TITLE_LEFT,
+            _TITLE_TOP,
+            _TITLE_W,
+            _TITLE_H,
+        )
+        title_tf = title_box.text_frame
+        title_tf.word_wrap = True
+        title_tf.clear()
+
+        title_para = title_tf.paragraphs[0]
+        title_para.text = slide_data.title or request.topic
+        title_para.font.size = _PT_34
+        title_para.font.bold = True
+        title_para.font.color.rgb = theme["title_color"]
+
+        # Optional subtle accent bar under title
+        shape = slide.shapes.add_shape(
+            autoshape_type_id=1,  # rectangle
+            left=_ACCENT_LEFT,
+            top=_ACCENT_TOP,
+            width=_ACCENT_W,
+            height=_ACCENT_H,
+        )
+        shape.fill.solid()
+        shape.fill.fore_color.rgb = theme["accent"]
+        shape.line.fill.background()
+
+        # -------------------------------
+        # PREP BULLETS (truncate to avoid overflow)
+        # -------------------------------
+        bullets_raw = slide_data.content or []
+        if isinstance(bullets_raw, str):
+            bullets_raw = [bullets_raw]
+
+        cleaned: List[str] = []
+        for b in bullets_raw:
+            if not b:
+                continue
+            text = str(b).strip()
+            if not text:
+                continue
+            cleaned.append(_truncate(text, max_chars_per_bullet))
+
+        if len(cleaned) > max_bullets:
+            head = cleaned[: max_bullets - 1]
+            tail = cleaned[max_bullets - 1 :]
+            merged_tail = _truncate("; ".join(tail), max_chars_per_bullet)
+            head.append("Further details: " + merged_tail)
+            cleaned = head
+
+        bullets = cleaned
+        if not bullets and slide_data.type != SlideType.TITLE:
+            bullets = [f"Key ideas about {slide_data.title or request.topic}."]
+
+        # -------------------------------
+        # TEXT BLOCK (LEFT) – dynamic vertical position
+        # -------------------------------
+        bullet_count = len(bullets)
+
+        if slide_data.type == SlideType.TITLE and not bullets_raw:
+            # Pure title slide (no bullets)
+            text_top, text_height = _TEXT_TITLE_ONLY
+        else:
+            if bullet_count <= 3:
+                # Short slide: center text more vertically
+                text_top, text_height = _TEXT_SHORT
+            else:
+                # Normal / long content
+                text_top, text_height = _TEXT_LONG
+
+        content_box = slide.shapes.add_textbox(
+            _TEXT_LEFT,
+            text_top,
+            _TEXT_W,
+            text_height,
+        )
+        tf = content_box.text_frame
+        tf.clear()
+        tf.word_wrap = True
+
+        if bullets:
+            # Control chars would split the run (line breaks) or break
+            # the raw <a:t> XML of the clones, so flatten them first
+            texts = [_CONTROL_CHARS_RE.sub(" ", f"• {b}") for b in bullets]
+
+            p = tf.paragraphs[0]
+            p.text = texts[0]
+            p.level = 0
+            p.font.size = bullet_font_size
+            p.font.bold = False
+            p.font.color.rgb = theme["body_color"]
+            p.line_spacing = 1.15
+            p.space_after = _PT_4
+            p.space_before = _PT_1
+
+            # Clone the styled first bullet's XML for the rest and only
+            # swap the run text: one deepcopy per bullet instead of seven
+            # property setters
+            template_p = p._p
+            tx_body = tf._txBody
+            for text in texts[1:]:
+                new_p = copy.deepcopy(template_p)
+                new_p.r_lst[0].t.text = text
+                tx_body.append(new_p)
+
+        # -------------------------------
+        # IMAGE BLOCK (RIGHT)
+        # -------------------------------
+        if slide_data.image_url:
+            img_stream = images.get(slide_data.image_url)
+
+            if img_stream:
+                try:
+                    img_stream.seek(0)  # same URL may appear on several slides
+                    max_width = _IMG_MAX_W
+                    max_height = _IMG_MAX_H
+
+                    pic = slide.shapes.add_picture(img_stream, _IMG_LEFT, _IMG_TOP)
+
+                    # Scale to fit width
+                    if pic.width > max_width:
+                        scale = max_width / pic.width
+                        pic.width = int(pic.width * scale)
+                        pic.height = int(pic.height * scale)
+
+                    # Scale to fit height
+                    if pic.height > max_height:
+                        scale = max_height / pic.height
+                        pic.width = int(pic.width * scale)
+                        pic.height = int(pic.height * scale)
+
+                    # Center vertically in reserved block
+                    pic.top = int(_IMG_TOP + (max_height - pic.height) / 2)
+
+                except Exception as e:
+                    log.warning("[PPTX] Error placing image: %s", e)
+
+    if isinstance(file_or_stream, str):
+        # One large buffer so the zip writer issues few write() syscalls.
+        # No fsync: decks are regenerable, durability isn't needed.
+        with open(file_or_stream, "wb", buffering=PPTX_WRITE_BUFFER) as fh:
+            prs.save(fh)
+    else:
+        prs.save(file_or_stream)
+
+
+# ---------------------------------------------------------------------------
+# POOL WORKER ENTRY POINT (top-level, so it pickles by reference)
+# ---------------------------------------------------------------------------
+def build_pptx_job(
+    file_path: Optional[str],
+    request: PresentationRequest,
+    slides: List[SlideContent],
+    images: Dict[str, io.BytesIO],
+) -> Optional[bytes]:
+    """Write `file_path`, or return the .pptx bytes when it is None."""
+    if file_path is None:
+        return build_pptx_bytes(request, slides, images)
+    build_pptx(file_path, request, slides, images)
+    return None
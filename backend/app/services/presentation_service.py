@@ -1,30 +1,188 @@
+import asyncio
+import hashlib
+import logging
+import multiprocessing
 import os
 import io
+import shutil
 import time
 import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import OrderedDict
 from datetime import datetime
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
-import requests
-from pptx import Presentation
-from pptx.util import Inches, Pt
-from pptx.dml.color import RGBColor
+import httpx
+import orjson
+from PIL import Image
+from pydantic import TypeAdapter
 
+from app.core.config import IMAGE_CACHE_DIR, PRES_CACHE_DIR, PRESENTATIONS_DIR
 from app.models.schemas import (
     PresentationRequest,
     PresentationResponse,
     SlideContent,
-    SlideType,
-    Language,
-    PresentationStyle,
 )
-from app.services.llm_service import llm_service
+from app.services.llm_service import StreamOutcome, llm_service
 from app.services.image_service import image_service
+from app.services.pptx_builder import PPTX_WRITE_BUFFER, build_pptx_job
+
+log = logging.getLogger("eduslide.presentation")
+
+# Image prefetch: concurrent downloads on the event loop over one shared
+# keep-alive HTTP/2 client
+_AHTTP = httpx.AsyncClient(
+    http2=True,
+    timeout=httpx.Timeout(12.0),
+    limits=httpx.Limits(max_keepalive_connections=16, max_connections=32),
+    headers={"User-Agent": "eduslide-ai/1.0"},
+    follow_redirects=True,
+)
+
+# Finished-deck cache is trimmed (least recently used first) above this size
+PRES_CACHE_MAX_BYTES = 500 * 1024 * 1024
+# Same policy for downloaded (already optimized) images
+IMAGE_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+_SLIDES_ADAPTER = TypeAdapter(List[SlideContent])
+
+# Fire-and-forget disk writes for inline downloads
+_BACKGROUND_TASKS: set[asyncio.Task] = set()
+
+
+def _write_file_atomic(path: str, data: bytes) -> None:
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "wb", buffering=PPTX_WRITE_BUFFER) as fh:
+            fh.write(data)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        log.warning("[PPTX] Could not save '%s': %s", path, e)
+
 
-# Base directory for saved PPTX files
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-PRESENTATIONS_DIR = os.path.join(BASE_DIR, "generated_presentations")
-os.makedirs(PRESENTATIONS_DIR, exist_ok=True)
+# In-memory LRU in front of the on-disk image cache. Only touched from the
+# event loop, so no lock is needed.
+IMAGE_MEMORY_CACHE_SIZE = 256
+_IMAGE_MEMORY: "OrderedDict[str, bytes]" = OrderedDict()
+
+# Embedded images are shown at ~5.6in wide; 1600px is plenty for a projector
+IMAGE_MAX_WIDTH = 1600
+IMAGE_JPEG_QUALITY = 85
+
+
+def _optimize_image(content: bytes) -> bytes:
+    """
+    Downscale to IMAGE_MAX_WIDTH and re-encode (JPEG, or PNG when the image
+    has transparency). Returns the original bytes if Pillow can't decode
+    them (e.g. SVG) or if re-encoding doesn't make them smaller.
+    """
+    try:
+        img = Image.open(io.BytesIO(content))
+        img.load()
+        if img.width > IMAGE_MAX_WIDTH:
+            height = max(1, int(img.height * IMAGE_MAX_WIDTH / img.width))
+            img = img.resize((IMAGE_MAX_WIDTH, height), Image.LANCZOS)
+
+        out = io.BytesIO()
+        if img.mode in ("RGBA", "LA") or "transparency" in img.info:
+            img.save(out, format="PNG", optimize=True)
+        else:
+            img.convert("RGB").save(
+                out, format="JPEG", quality=IMAGE_JPEG_QUALITY, optimize=True, progressive=True
+            )
+    except Exception as e:
+        log.debug("[ImageOptimize] Keeping original bytes: %s", e)
+        return content
+
+    optimized = out.getvalue()
+    return optimized if len(optimized) < len(content) else content
+
+
+def _image_cache_path(url: str) -> str:
+    return os.path.join(IMAGE_CACHE_DIR, hashlib.sha256(url.encode("utf-8")).hexdigest())
+
+
+def _read_cached_image(url: str) -> Optional[bytes]:
+    cache_path = _image_cache_path(url)
+    try:
+        with open(cache_path, "rb") as fh:
+            content = fh.read()
+        os.utime(cache_path)  # LRU order; atime alone is unreliable (noatime)
+    except FileNotFoundError:
+        return None
+    return content
+
+
+def _store_image(url: str, raw: bytes) -> bytes:
+    """
+    Optimize freshly downloaded bytes, write them to the disk cache and trim
+    it. Runs in a worker thread.
+    """
+    # Cache the optimized bytes so the resize cost is paid once per URL
+    content = _optimize_image(raw)
+
+    cache_path = _image_cache_path(url)
+    # Unique tmp name: concurrent downloads may race on the same URL
+    tmp_path = f"{cache_path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, "wb") as fh:
+            fh.write(content)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        log.warning("[ImageCache] Could not store '%s': %s", url, e)
+        return content
+    _evict_image_cache()
+    return content
+
+
+def _evict_image_cache() -> None:
+    """Trim IMAGE_CACHE_DIR to IMAGE_CACHE_MAX_BYTES, oldest mtime first."""
+    entries = []
+    try:
+        with os.scandir(IMAGE_CACHE_DIR) as it:
+            for entry in it:
+                # Skip in-flight writes from concurrent downloads
+                if not entry.name.endswith(".tmp"):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+    except OSError as e:
+        log.warning("[ImageCache] Could not scan cache: %s", e)
+        return
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= IMAGE_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+async def _aimage_bytes(url: str) -> bytes:
+    """
+    Image bytes for `url`: disk cache first, network on a miss.
+    Raises on download failure so errors are never cached.
+    File and Pillow work go to worker threads.
+    Returns bytes (not BytesIO, which is stateful) so hits can be shared.
+    """
+    content = _IMAGE_MEMORY.get(url)
+    if content is not None:
+        _IMAGE_MEMORY.move_to_end(url)
+        return content
+
+    content = await asyncio.to_thread(_read_cached_image, url)
+    if content is None:
+        resp = await _AHTTP.get(url)
+        resp.raise_for_status()
+        content = await asyncio.to_thread(_store_image, url, resp.content)
+
+    _IMAGE_MEMORY[url] = content
+    if len(_IMAGE_MEMORY) > IMAGE_MEMORY_CACHE_SIZE:
+        _IMAGE_MEMORY.popitem(last=False)
+    return content
 
 
 class PresentationService:
@@ -42,31 +200,40 @@ class PresentationService:
         self, request: PresentationRequest
     ) -> PresentationResponse:
         start_time = time.perf_counter()
+        self._ensure_valid(request)
 
-        # Basic extra safety
-        ok, msg = self.validate_request(request)
-        if not ok:
-            raise ValueError(msg)
+        presentation_id = self._new_presentation_id()
+        filename = f"eduslide_ai_{presentation_id}.pptx"
+        file_path = os.path.join(PRESENTATIONS_DIR, filename)
 
-        # 1) Generate slide content using the LLM
-        slides: List[SlideContent] = llm_service.generate_slide_content(request)
+        # 0) Identical request seen before: copy the finished deck
+        cache_key = self._pres_cache_key(request)
+        slides = await asyncio.to_thread(self._load_cached_presentation, cache_key, file_path)
 
-        # 2) Attach hybrid images (and avoid duplicates)
-        self._attach_images_to_slides(request, slides)
+        if slides is None:
+            # 1-2) Slide content + images
+            slides, cacheable = await self._prepare_slides(request)
 
-        # 3) Prepare file path
-        presentation_id = f"pres_{uuid.uuid4().hex[:12]}"
-        filename = f"eduslide_ai_{presentation_id}.pptx"
-        file_path = os.path.join(PRESENTATIONS_DIR, filename)
+            # 3-4) Download images on the event loop, then build the PPTX
+            #      file (CPU work, kept off the event loop)
+            images = await self._aprefetch_images(slides)
+            await self._build_in_pool(file_path, request, slides, images)
 
-        # 4) Build PPTX file
-        self._build_pptx(file_path, request, slides)
+            # Only decks of real model output with every image in place are
+            # replayed; degraded ones (template text, placeholder or failed
+            # images) are rebuilt on the next identical request
+            if cacheable and all(s.image_url in images for s in slides):
+                await asyncio.to_thread(self._store_cached_presentation, cache_key, file_path, slides)
+            else:
+                log.info("[PresCache] Not caching degraded deck for '%s'", request.topic)
 
         # 5) Metadata
         generation_time = time.perf_counter() - start_time
         created_at = datetime.utcnow().isoformat()
 
-        return PresentationResponse(
+        # Every field is already validated (request + SlideContent models),
+        # so skip re-validating the whole tree
+        return PresentationResponse.model_construct(
             presentation_id=presentation_id,
             metadata=request,
             slides=slides,
@@ -75,6 +242,139 @@ class PresentationService:
             generation_time=generation_time,
         )
 
+    async def generate_presentation_inline(
+        self, request: PresentationRequest
+    ) -> Tuple[str, bytes]:
+        """
+        Build the deck fully in memory and return (presentation_id, pptx_bytes)
+        for a direct download. A copy is saved in the background so
+        /download/{presentation_id} keeps working, without delaying the reply.
+        """
+        self._ensure_valid(request)
+        slides, _ = await self._prepare_slides(request)
+        presentation_id = self._new_presentation_id()
+
+        images = await self._aprefetch_images(slides)
+        pptx_bytes = await self._build_in_pool(None, request, slides, images)
+        self._persist_in_background(presentation_id, pptx_bytes)
+        return presentation_id, pptx_bytes
+
+    async def _prepare_slides(
+        self, request: PresentationRequest
+    ) -> Tuple[List[SlideContent], bool]:
+        """
+        Returns (slides, cacheable): cacheable is True only if the slides are
+        a complete model deck and every slide got a real (non-placeholder)
+        image URL.
+        """
+        # 1) Stream slides from the LLM; 2) start each slide's image lookup
+        #    as soon as it arrives, overlapping with the rest of generation
+        slides: List[SlideContent] = []
+        image_tasks: List[asyncio.Task] = []
+        used_urls: set[str] = set()
+        outcome = StreamOutcome()
+
+        async for slide in llm_service.astream_slide_content(request, outcome):
+            image_tasks.append(
+                asyncio.create_task(
+                    self._attach_image_to_slide(request, slide, len(slides), used_urls)
+                )
+            )
+            slides.append(slide)
+
+        resolved = await asyncio.gather(*image_tasks)
+        return slides, outcome.from_model and outcome.complete and all(resolved)
+
+    def _new_presentation_id(self) -> str:
+        return f"pres_{uuid.uuid4().hex[:12]}"
+
+    def _persist_in_background(self, presentation_id: str, pptx_bytes: bytes) -> None:
+        file_path = os.path.join(PRESENTATIONS_DIR, f"eduslide_ai_{presentation_id}.pptx")
+        task = asyncio.create_task(asyncio.to_thread(_write_file_atomic, file_path, pptx_bytes))
+        # Keep a reference until done, or the task may be garbage-collected
+        _BACKGROUND_TASKS.add(task)
+        task.add_done_callback(_BACKGROUND_TASKS.discard)
+
+    def _ensure_valid(self, request: PresentationRequest) -> None:
+        # Basic extra safety
+        ok, msg = self.validate_request(request)
+        if not ok:
+            raise ValueError(msg)
+
+    # ------------------------------------------------------------------
+    # FINISHED-DECK CACHE
+    # ------------------------------------------------------------------
+    def _pres_cache_key(self, request: PresentationRequest) -> str:
+        parts = (
+            " ".join(request.topic.lower().split()),
+            request.presentation_style.value,
+            request.audience_level.value,
+            request.language.value,
+            request.num_slides,
+            request.include_quiz,
+            request.speaker_notes,
+        )
+        return hashlib.sha256("|".join(map(str, parts)).encode("utf-8")).hexdigest()
+
+    def _load_cached_presentation(
+        self, key: str, file_path: str
+    ) -> Optional[List[SlideContent]]:
+        """On a hit, copy the cached deck to `file_path` and return its slides."""
+        pptx_path = os.path.join(PRES_CACHE_DIR, f"{key}.pptx")
+        slides_path = os.path.join(PRES_CACHE_DIR, f"{key}.slides.json")
+        try:
+            with open(slides_path, "rb") as fh:
+                slides = _SLIDES_ADAPTER.validate_python(orjson.loads(fh.read()))
+            shutil.copyfile(pptx_path, file_path)
+            os.utime(pptx_path)  # LRU order; atime alone is unreliable (noatime)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            log.warning("[PresCache] Ignoring unreadable entry %s: %s", key, e)
+            return None
+        return slides
+
+    def _store_cached_presentation(
+        self, key: str, file_path: str, slides: List[SlideContent]
+    ) -> None:
+        pptx_path = os.path.join(PRES_CACHE_DIR, f"{key}.pptx")
+        slides_path = os.path.join(PRES_CACHE_DIR, f"{key}.slides.json")
+        tmp_suffix = f".{uuid.uuid4().hex}.tmp"
+        try:
+            # Deck first: an entry only counts once its slides file exists
+            shutil.copyfile(file_path, pptx_path + tmp_suffix)
+            os.replace(pptx_path + tmp_suffix, pptx_path)
+            with open(slides_path + tmp_suffix, "wb") as fh:
+                fh.write(orjson.dumps([s.model_dump(mode="json") for s in slides]))
+            os.replace(slides_path + tmp_suffix, slides_path)
+        except OSError as e:
+            log.warning("[PresCache] Could not store %s: %s", key, e)
+            return
+        self._evict_presentation_cache()
+
+    def _evict_presentation_cache(self) -> None:
+        entries = []
+        try:
+            with os.scandir(PRES_CACHE_DIR) as it:
+                for entry in it:
+                    if entry.name.endswith(".pptx"):
+                        st = entry.stat()
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+        except OSError as e:
+            log.warning("[PresCache] Could not scan cache: %s", e)
+            return
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= PRES_CACHE_MAX_BYTES:
+                break
+            for victim in (path, path[: -len(".pptx")] + ".slides.json"):
+                try:
+                    os.remove(victim)
+                except FileNotFoundError:
+                    pass
+            total -= size
+
     # ------------------------------------------------------------------
     # VALIDATION
     # ------------------------------------------------------------------
@@ -88,301 +388,129 @@ class PresentationService:
 
         return True, ""
 
-    # ------------------------------------------------------------------
-    # THEME SELECTION  (no external .pptx files needed)
-    # ------------------------------------------------------------------
-    def _get_theme_for_request(self, request: PresentationRequest) -> dict:
-        """
-        Return a simple theme config (colors + sizing tweaks)
-        based on the selected PresentationStyle.
-        """
-
-        # Default "clean light" theme
-        theme = {
-            "bg": RGBColor(245, 246, 250),
-            "title_color": RGBColor(20, 20, 20),
-            "body_color": RGBColor(30, 30, 30),
-            "accent": RGBColor(52, 120, 246),      # blue
-            "subtitle_color": RGBColor(90, 90, 90),
-        }
-
-        style = request.presentation_style
-
-        if style == PresentationStyle.ACADEMIC:
-            theme = {
-                "bg": RGBColor(250, 252, 255),
-                "title_color": RGBColor(15, 40, 80),
-                "body_color": RGBColor(35, 35, 45),
-                "accent": RGBColor(52, 84, 209),    # academic blue
-                "subtitle_color": RGBColor(70, 80, 110),
-            }
-        elif style == PresentationStyle.STORYTELLING:
-            theme = {
-                "bg": RGBColor(255, 251, 245),
-                "title_color": RGBColor(80, 40, 20),
-                "body_color": RGBColor(55, 45, 40),
-                "accent": RGBColor(230, 126, 34),   # warm orange
-                "subtitle_color": RGBColor(120, 90, 70),
-            }
-        elif style == PresentationStyle.VISUAL:
-            theme = {
-                "bg": RGBColor(245, 248, 255),
-                "title_color": RGBColor(25, 25, 35),
-                "body_color": RGBColor(40, 40, 50),
-                "accent": RGBColor(46, 204, 113),   # green accent
-                "subtitle_color": RGBColor(90, 100, 120),
-            }
-        elif style == PresentationStyle.TECHNICAL:
-            theme = {
-                "bg": RGBColor(20, 24, 31),
-                "title_color": RGBColor(236, 240, 241),
-                "body_color": RGBColor(221, 230, 234),
-                "accent": RGBColor(52, 152, 219),   # tech blue
-                "subtitle_color": RGBColor(171, 178, 185),
-            }
-
-        return theme
-
     # ------------------------------------------------------------------
     # IMAGE SELECTION
     # ------------------------------------------------------------------
-    def _attach_images_to_slides(
+    async def _attach_image_to_slide(
         self,
         request: PresentationRequest,
-        slides: List[SlideContent],
-    ) -> None:
+        slide: SlideContent,
+        slide_index: int,
+        used_urls: set[str],
+    ) -> bool:
         """
-        For each slide, ask the hybrid image engine for the best image URL.
-        Also keeps track of used URLs to prevent repetition.
+        Ask the hybrid image engine for the best image URL for one slide.
+        Lookups for different slides run concurrently; they share one
+        `used_urls` set, which the image service updates as soon as it picks
+        a URL, to limit repeats. Returns False if only a placeholder (or
+        nothing) was found.
         """
-        topic = request.topic
-        used_urls: set[str] = set()
-
-        for idx, slide in enumerate(slides):
-            url = image_service.get_hybrid_image_for_slide(
-                topic=topic,
-                slide=slide,
-                slide_index=idx,
-                language=request.language,
-                presentation_style=request.presentation_style,
-                used_urls=used_urls,
-            )
-            slide.image_url = url
-            if url:
-                used_urls.add(url)
+        slide.image_url = await image_service.get_hybrid_image_for_slide(
+            topic=request.topic,
+            slide=slide,
+            slide_index=slide_index,
+            language=request.language,
+            presentation_style=request.presentation_style,
+            used_urls=used_urls,
+        )
+        return bool(slide.image_url) and not image_service.is_placeholder_image(slide.image_url)
 
     # ------------------------------------------------------------------
-    # PPTX BUILDING (themes + layout + bullet safety)
+    # PPTX BUILDING (rendering lives in pptx_builder)
     # ------------------------------------------------------------------
-    def _build_pptx(
+    async def _build_in_pool(
         self,
-        file_path: str,
+        file_path: Optional[str],
         request: PresentationRequest,
         slides: List[SlideContent],
-    ) -> None:
+        images: Dict[str, io.BytesIO],
+    ) -> Optional[bytes]:
         """
-        Builds the .pptx file with:
-        - 16:9 widescreen size
-        - Themed background + colors
-        - Title at the top
-        - Bullet text on the left (overflow-safe)
-        - Image on the right (scaled + centered)
+        Run the CPU-bound build off the event loop: in a worker process when
+        this is the only API process (so concurrent builds use several cores
+        instead of sharing one GIL), else in a thread. Writes `file_path`, or
+        returns the .pptx bytes when it is None.
         """
+        if not PPTX_POOL_WORKERS:
+            return await asyncio.to_thread(build_pptx_job, file_path, request, slides, images)
 
-        prs = Presentation()
-
-        # Force 16:9 widescreen so width isn't tiny
-        prs.slide_width = Inches(13.33)
-        prs.slide_height = Inches(7.5)
-
-        theme = self._get_theme_for_request(request)
-        is_dark = request.presentation_style == PresentationStyle.TECHNICAL
-        is_bilingual = request.language == Language.BILINGUAL
-
-        # Text sizing rules
-        if is_bilingual:
-            max_bullets = 4
-            max_chars_per_bullet = 160
-            bullet_font_size = Pt(16)
-        else:
-            max_bullets = 5
-            max_chars_per_bullet = 200
-            bullet_font_size = Pt(18)
-
-        for slide_index, slide_data in enumerate(slides):
-            layout = prs.slide_layouts[6]  # blank slide
-            slide = prs.slides.add_slide(layout)
-
-            # -------------------------------
-            # BACKGROUND COLOR (theme)
-            # -------------------------------
-            fill = slide.background.fill
-            fill.solid()
-            fill.fore_color.rgb = theme["bg"]
-
-            # -------------------------------
-            # TITLE
-            # -------------------------------
-            title_box = slide.shapes.add_textbox(
-                Inches(0.6),
-                Inches(0.3),
-                Inches(11.8),
-                Inches(1.0),
-            )
-            title_tf = title_box.text_frame
-            title_tf.word_wrap = True
-            title_tf.clear()
-
-            title_para = title_tf.paragraphs[0]
-            title_para.text = slide_data.title or request.topic
-            title_para.font.size = Pt(34)
-            title_para.font.bold = True
-            title_para.font.color.rgb = theme["title_color"]
-
-            # Optional subtle accent bar under title
-            accent_left = Inches(0.6)
-            accent_top = Inches(1.25)
-            accent_width = Inches(2.5)
-            accent_height = Inches(0.08)
-            shape = slide.shapes.add_shape(
-                autoshape_type_id=1,  # rectangle
-                left=accent_left,
-                top=accent_top,
-                width=accent_width,
-                height=accent_height,
+        loop = asyncio.get_running_loop()
+        pool = _pptx_pool()
+        try:
+            return await loop.run_in_executor(
+                pool, build_pptx_job, file_path, request, slides, images
             )
-            shape.fill.solid()
-            shape.fill.fore_color.rgb = theme["accent"]
-            shape.line.fill.background()
-
-            # -------------------------------
-            # PREP BULLETS (truncate to avoid overflow)
-            # -------------------------------
-            bullets_raw = slide_data.content or []
-            if isinstance(bullets_raw, str):
-                bullets_raw = [bullets_raw]
-
-            cleaned: List[str] = []
-            for b in bullets_raw:
-                if not b:
-                    continue
-                text = str(b).strip()
-                if not text:
-                    continue
-                if len(text) > max_chars_per_bullet:
-                    cut = text[:max_chars_per_bullet]
-                    if " " in cut:
-                        cut = cut.rsplit(" ", 1)[0]
-                    text = cut + "..."
-                cleaned.append(text)
-
-            if len(cleaned) > max_bullets:
-                head = cleaned[: max_bullets - 1]
-                tail = cleaned[max_bullets - 1 :]
-                merged_tail = "; ".join(tail)
-                if len(merged_tail) > max_chars_per_bullet:
-                    merged_cut = merged_tail[:max_chars_per_bullet]
-                    if " " in merged_cut:
-                        merged_cut = merged_cut.rsplit(" ", 1)[0]
-                    merged_tail = merged_cut + "..."
-                head.append("Further details: " + merged_tail)
-                cleaned = head
-
-            bullets = cleaned
-            if not bullets and slide_data.type != SlideType.TITLE:
-                bullets = [f"Key ideas about {slide_data.title or request.topic}."]
-
-            # -------------------------------
-            # TEXT BLOCK (LEFT) – dynamic vertical position
-            # -------------------------------
-            bullet_count = len(bullets)
-
-            if slide_data.type == SlideType.TITLE and not bullets_raw:
-                # Pure title slide (no bullets)
-                text_top = Inches(2.3)
-                text_height = Inches(3.5)
-            else:
-                if bullet_count <= 3:
-                    # Short slide: center text more vertically
-                    text_top = Inches(2.1)
-                    text_height = Inches(3.8)
-                else:
-                    # Normal / long content
-                    text_top = Inches(1.5)
-                    text_height = Inches(5.1)
-
-            content_box = slide.shapes.add_textbox(
-                Inches(0.8),
-                text_top,
-                Inches(6.1),
-                text_height,
+        except BrokenProcessPool:
+            # A worker died (OOM kill, crash): replace the pool and retry once
+            log.warning("[PPTX] Worker pool broken; restarting it")
+            _reset_pptx_pool(pool)
+            return await loop.run_in_executor(
+                _pptx_pool(), build_pptx_job, file_path, request, slides, images
             )
-            tf = content_box.text_frame
-            tf.clear()
-            tf.word_wrap = True
-
-            for i, bullet in enumerate(bullets):
-                if i == 0:
-                    p = tf.paragraphs[0]
-                else:
-                    p = tf.add_paragraph()
-
-                p.text = f"• {bullet}"
-                p.level = 0
-                p.font.size = bullet_font_size
-                p.font.bold = False
-                p.font.color.rgb = theme["body_color"]
-                p.line_spacing = 1.15
-                p.space_after = Pt(4)
-                p.space_before = Pt(1)
-
-            # -------------------------------
-            # IMAGE BLOCK (RIGHT)
-            # -------------------------------
-            if slide_data.image_url:
-                img_stream = self._download_image(slide_data.image_url)
-
-                if img_stream:
-                    try:
-                        img_left = Inches(7.2)
-                        img_top = Inches(1.7)
-                        max_width = Inches(5.6)
-                        max_height = Inches(5.0)
-
-                        pic = slide.shapes.add_picture(img_stream, img_left, img_top)
-
-                        # Scale to fit width
-                        if pic.width > max_width:
-                            scale = max_width / pic.width
-                            pic.width = int(pic.width * scale)
-                            pic.height = int(pic.height * scale)
-
-                        # Scale to fit height
-                        if pic.height > max_height:
-                            scale = max_height / pic.height
-                            pic.width = int(pic.width * scale)
-                            pic.height = int(pic.height * scale)
-
-                        # Center vertically in reserved block
-                        pic.top = int(img_top + (max_height - pic.height) / 2)
-
-                    except Exception as e:
-                        print(f"[PPTX] Error placing image: {e}")
-
-        prs.save(file_path)
 
     # ------------------------------------------------------------------
     # IMAGE DOWNLOAD
     # ------------------------------------------------------------------
-    def _download_image(self, url: str) -> io.BytesIO | None:
+    async def _aprefetch_images(self, slides: List[SlideContent]) -> Dict[str, io.BytesIO]:
+        urls = list(dict.fromkeys(s.image_url for s in slides if s.image_url))
+        streams = await asyncio.gather(*(self._adownload_image(url) for url in urls))
+        return {url: stream for url, stream in zip(urls, streams) if stream}
+
+    async def _adownload_image(self, url: str) -> io.BytesIO | None:
         try:
-            resp = requests.get(url, timeout=12)
-            resp.raise_for_status()
-            return io.BytesIO(resp.content)
+            return io.BytesIO(await _aimage_bytes(url))
         except Exception as e:
-            print(f"[ImageDownload] Error for '{url}': {e}")
+            log.warning("[ImageDownload] Error for '%s': %s", url, e)
             return None
 
+    async def aclose(self) -> None:
+        """Close the shared image download client and the PPTX worker pool."""
+        await _AHTTP.aclose()
+        if _PPTX_POOL is not None:
+            _PPTX_POOL.shutdown(wait=False, cancel_futures=True)
+
 
 # Singleton instance
 presentation_service = PresentationService()
+
+
+# ---------------------------------------------------------------------------
+# PPTX WORKER POOL
+# ---------------------------------------------------------------------------
+def _api_workers() -> int:
+    """uvicorn worker count: WEB_CONCURRENCY is the default for --workers
+    and is set by the `python -m app` launcher."""
+    try:
+        return max(1, int(os.environ.get("WEB_CONCURRENCY") or 1))
+    except ValueError:
+        return 1
+
+
+# A pool only pays off in a single API process. With several uvicorn
+# workers the builds already spread across cores, so each worker builds in
+# a thread (0) rather than adding a process pool of its own.
+PPTX_POOL_WORKERS = min(4, os.cpu_count() or 1) if _api_workers() == 1 else 0
+_PPTX_POOL: Optional[ProcessPoolExecutor] = None
+
+
+def _pptx_pool() -> ProcessPoolExecutor:
+    global _PPTX_POOL
+    if _PPTX_POOL is None:
+        # spawn, not fork: the API process already runs threads (logging
+        # listener, HTTP pools) that must not be forked mid-operation.
+        # Jobs live in pptx_builder, so workers never import the services.
+        # Spawned pools start processes on demand, so nothing runs until
+        # the first build.
+        _PPTX_POOL = ProcessPoolExecutor(
+            max_workers=PPTX_POOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _PPTX_POOL
+
+
+def _reset_pptx_pool(broken: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next _pptx_pool() call starts a fresh one."""
+    global _PPTX_POOL
+    if _PPTX_POOL is broken:
+        _PPTX_POOL = None
+    broken.shutdown(wait=False, cancel_futures=True)
@@ -9,33 +9,81 @@ API client for talking to the FastAPI backend from Streamlit.
 - Fetches PPTX bytes for download
 """
 
+import logging
+import time
+
+import orjson
 import requests
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+from urllib3.util.retry import Retry
 
 from config import Config
 
+log = logging.getLogger("eduslide.api_client")
+
+# Seconds a health probe result is reused before the backend is re-checked
+HEALTH_CACHE_TTL = 10.0
+
+# (connect, read) timeout for PPTX downloads; a stalled backend can never
+# block the Streamlit script thread for longer than this
+DOWNLOAD_TIMEOUT: Tuple[float, float] = (5, 60)
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Download progress callback: (bytes_received, total_bytes or 0 if unknown)
+ProgressCallback = Callable[[int, int], None]
+
 
 class APIClient:
     def __init__(self) -> None:
         self.base_url = Config.BACKEND_URL.rstrip("/")
 
+        # One keep-alive session for every backend call (health, generate,
+        # download). Only idempotent methods are retried (urllib3 default),
+        # so a slow /generate POST is never sent twice.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # Last health result and when it was taken (time.monotonic)
+        self._health: Optional[Dict[str, Any]] = None
+        self._health_at = 0.0
+
     # --------------------------------------------------
     # HEALTH CHECK
     # --------------------------------------------------
     def check_health(self) -> Dict[str, Any]:
         try:
-            resp = requests.get(f"{self.base_url}/health", timeout=5)
+            resp = self.session.get(f"{self.base_url}/health", timeout=5)
             resp.raise_for_status()
-            data = resp.json()
+            data = orjson.loads(resp.content)
             # Ensure a consistent shape for the Streamlit sidebar
             return {
                 "status": data.get("status", "unknown"),
                 "version": data.get("version", Config.APP_VERSION),
             }
-        except Exception as e:
-            print("[APIClient] Health check error:", e)
+        except (requests.RequestException, ValueError) as e:
+            log.warning("Health check error: %s", e)
             return {"status": "offline", "version": None}
 
+    def cached_health(self, ttl: float = HEALTH_CACHE_TTL) -> Dict[str, Any]:
+        """
+        Health result reused for `ttl` seconds, so Streamlit reruns (one per
+        widget event) don't each probe the backend.
+        """
+        now = time.monotonic()
+        if self._health is None or now - self._health_at >= ttl:
+            self._health = self.check_health()
+            self._health_at = now
+        return self._health
+
     # --------------------------------------------------
     # PUBLIC: Generate presentation
     # --------------------------------------------------
@@ -49,21 +97,25 @@ class APIClient:
         complexity: str,
         include_images: bool,
         include_notes: bool,
+        progress_cb: Optional[ProgressCallback] = None,
     ) -> Dict[str, Any]:
         """
         Call backend /generate with:
         - normalized enums the backend expects
         - rich topic containing all user options (Gamma-like control)
+
+        `progress_cb` is forwarded to the PPTX download; it is first called
+        with 0 bytes when the download starts.
         """
 
         # 1. Normalize options to backend-safe enums
-        backend_audience = self._normalize_audience(audience_type)
-        backend_style = self._normalize_style(style)
-        backend_language = self._normalize_language(language)
-        backend_complexity = self._normalize_complexity(complexity)
+        backend_audience = _normalize_audience(audience_type)
+        backend_style = _normalize_style(style)
+        backend_language = _normalize_language(language)
+        backend_complexity = _normalize_complexity(complexity)
 
         # 2. Build a "rich topic" that encodes all options for the LLM
-        rich_topic = self._build_rich_topic(
+        rich_topic = _build_rich_topic(
             topic=topic,
             audience_label=audience_type,
             style_label=style,
@@ -84,30 +136,37 @@ class APIClient:
         }
 
         try:
-            resp = requests.post(
+            # Pre-serialized with orjson (straight to bytes, no str + encode)
+            resp = self.session.post(
                 f"{self.base_url}/generate",
-                json=payload,
+                data=orjson.dumps(payload),
+                headers=_JSON_HEADERS,
                 timeout=120,
             )
             if resp.status_code != 201:
-                # backend returned an error (422, 500, etc.)
+                # backend returned an error (422, 500, etc.); read the body
+                # once and parse it at most once
+                raw = resp.content
                 try:
-                    err_json = resp.json()
-                except Exception:
-                    err_json = {"detail": resp.text}
-                print("[APIClient] Generate error:", resp.status_code, err_json)
+                    err_json = orjson.loads(raw)
+                except ValueError:
+                    err_json = {"detail": raw[:512].decode("utf-8", "replace")}
+                log.warning("Generate error: %s %r", resp.status_code, raw[:512])
                 return {
                     "status": "error",
                     "message": f"HTTP {resp.status_code}: {err_json}",
                 }
 
-            data = resp.json()
+            data = orjson.loads(resp.content)
 
-            # Extract key info from backend response
+            # Extract key info from backend response; keep only the slide
+            # fields the UI shows so the full payload can be freed before
+            # the PPTX download
             presentation_id = data.get("presentation_id")
-            slides = data.get("slides", [])
+            slides = [_preview_slide(s) for s in data.get("slides", [])]
             total_slides = data.get("total_slides", len(slides))
             generation_time = data.get("generation_time", 0.0)
+            del data
 
             # Try downloading PPTX bytes (optional but nice)
             file_bytes: Optional[bytes] = None
@@ -115,18 +174,7 @@ class APIClient:
             download_url = f"{self.base_url}/download/{presentation_id}"
 
             if presentation_id:
-                try:
-                    file_resp = requests.get(download_url, timeout=60)
-                    if file_resp.status_code == 200:
-                        file_bytes = file_resp.content
-                    else:
-                        print(
-                            "[APIClient] PPTX download error:",
-                            file_resp.status_code,
-                            file_resp.text,
-                        )
-                except Exception as e:
-                    print("[APIClient] PPTX download exception:", e)
+                file_bytes, filename = self.download_pptx(presentation_id, progress_cb=progress_cb)
 
             # Count how many slides actually got images
             images_added = sum(
@@ -148,117 +196,266 @@ class APIClient:
                 "images_added": images_added,
             }
 
-        except Exception as e:
-            print("[APIClient] Exception in generate_presentation:", e)
+        except (requests.RequestException, ValueError) as e:
+            log.warning("Exception in generate_presentation: %s", e)
             return {
                 "status": "error",
                 "message": f"Exception while calling backend: {e}",
             }
 
     # --------------------------------------------------
-    # NORMALIZATION HELPERS
-    # Map rich UI labels to backend-safe enums
+    # FILE DOWNLOAD
     # --------------------------------------------------
-    def _normalize_audience(self, audience_label: str) -> str:
-        """
-        Backend expects one of:
-        - 'elementary', 'middle', 'high', 'college', 'professional'
-
-        We map your UI options to these buckets.
-        """
-        text = (audience_label or "").lower()
-
-        if "6" in text or "school students" in text:
-            return "elementary"
-        if "11-12" in text or "high school" in text:
-            return "high"
-        if "college" in text or "university" in text:
-            return "college"
-        if "technical briefing" in text:
-            return "professional"
-        if "business presentation" in text:
-            return "professional"
-        if "professional training" in text:
-            return "professional"
-
-        # Safe default
-        return "college"
-
-    def _normalize_style(self, style_label: str) -> str:
-        """
-        Backend expects:
-        - 'academic', 'storytelling', 'interactive', 'technical', 'visual'
-        """
-        text = (style_label or "").lower()
-
-        if "academic" in text:
-            return "academic"
-        if "story" in text:
-            return "storytelling"
-        if "business" in text or "pitch" in text:
-            # Business pitch is usually visual + persuasive
-            return "visual"
-        if "deep" in text or "technical" in text:
-            return "technical"
-        if "workshop" in text or "interactive" in text:
-            return "interactive"
-        if "minimalist" in text:
-            return "visual"
-
-        # Fallback
-        return "academic"
-
-    def _normalize_language(self, lang_label: str) -> str:
-        """
-        Map frontend labels to backend Language enum values.
-        Assuming backend Language enum accepts:
-        - 'english', 'hindi', 'bilingual'
-        """
-        text = (lang_label or "").lower()
-        if "bilingual" in text:
-            return "bilingual"
-        if "hindi" in text:
-            return "hindi"
-        return "english"
-
-    def _normalize_complexity(self, complexity_label: str) -> str:
+    def download_pptx(
+        self,
+        presentation_id: str,
+        progress_cb: Optional[ProgressCallback] = None,
+    ) -> Tuple[Optional[bytes], str]:
         """
-        Forward the complexity as a simple lowercase string.
-
-        If backend uses an enum, it likely expects:
-        - 'beginner', 'intermediate', 'advanced', 'expert'
+        The single place PPTX bytes are fetched: shared session (with its
+        retries) and a hard DOWNLOAD_TIMEOUT. Returns (bytes or None, filename).
         """
-        text = (complexity_label or "intermediate").strip().lower()
-        valid = {"beginner", "intermediate", "advanced", "expert"}
-        return text if text in valid else "intermediate"
+        filename = f"eduslide_ai_{presentation_id}.pptx"
+        try:
+            data = self.fetch_bytes(
+                f"{self.base_url}/download/{presentation_id}",
+                timeout=DOWNLOAD_TIMEOUT,
+                progress_cb=progress_cb,
+            )
+        except requests.RequestException as e:
+            log.warning("PPTX download exception: %s", e)
+            data = None
+        return data, filename
 
-    # --------------------------------------------------
-    # RICH TOPIC FOR LLM
-    # --------------------------------------------------
-    def _build_rich_topic(
+    def fetch_bytes(
         self,
-        topic: str,
-        audience_label: str,
-        style_label: str,
-        language_label: str,
-        complexity_label: str,
-    ) -> str:
+        url: str,
+        timeout: Union[float, Tuple[float, float]] = DOWNLOAD_TIMEOUT,
+        progress_cb: Optional[ProgressCallback] = None,
+    ) -> Optional[bytes]:
         """
-        Gamma-like: we pass all user choices into the topic description
-        so the LLM can adapt tone, depth, and format.
-
-        Example:
-        "Understanding AI for Beginners
-         [Audience: College / University | Style: Technical deep-dive |
-          Language: English | Complexity: Intermediate]"
+        Stream a file into one pre-sized buffer (no second full copy as with
+        resp.content). Returns None on a non-200 reply; network errors raise.
+        `progress_cb(received, total)` is called at start and after each chunk.
         """
-        base = (topic or "").strip()
-
-        meta = (
-            f"Audience: {audience_label}; "
-            f"Style: {style_label}; "
-            f"Language: {language_label}; "
-            f"Complexity: {complexity_label}"
-        )
-
-        return f"{base}  [{meta}]"
+        with self.session.get(url, timeout=timeout, stream=True) as resp:
+            if resp.status_code != 200:
+                log.warning("PPTX download error: %s %.512s", resp.status_code, resp.text)
+                return None
+
+            size = _content_length(resp.headers.get("Content-Length"))
+            buf = bytearray(size)
+            view = memoryview(buf)
+            pos = 0
+            total = size
+            if progress_cb:
+                progress_cb(0, total)
+            for chunk in resp.iter_content(chunk_size=64 * 1024):
+                end = pos + len(chunk)
+                if end <= size:
+                    view[pos:end] = chunk
+                else:
+                    # Length header missing or short: fall back to growing
+                    view.release()
+                    del buf[pos:]
+                    buf.extend(chunk)
+                    size = end
+                    view = memoryview(buf)
+                pos = end
+                if progress_cb:
+                    progress_cb(pos, total)
+            view.release()
+
+            del buf[pos:]
+            return bytes(buf)
+
+
+def _content_length(value: Optional[str]) -> int:
+    """Parse a Content-Length header; 0 (unknown size) if absent or malformed."""
+    try:
+        size = int(value or 0)
+    except ValueError:
+        log.info("Ignoring malformed Content-Length: %.64r", value)
+        return 0
+    return max(size, 0)
+
+
+# --------------------------------------------------
+# RESPONSE SHAPING
+# --------------------------------------------------
+def _preview_slide(slide: Dict[str, Any]) -> Dict[str, Any]:
+    """Project a backend slide onto the keys the preview renders."""
+    return {
+        "title": slide.get("title"),
+        "content": slide.get("content"),
+        "image_url": slide.get("image_url"),
+        # Backend field is `speaker_notes`; the UI reads `notes`
+        "notes": slide.get("speaker_notes") or slide.get("notes"),
+    }
+
+
+# --------------------------------------------------
+# NORMALIZATION HELPERS
+# Map rich UI labels to backend-safe enums
+# --------------------------------------------------
+# Exact lookups for the fixed dropdown labels in Config; the substring
+# heuristics below only run for labels not listed here
+AUDIENCE_MAP = {
+    "School students (6–10)": "elementary",
+    "High school students (11–12)": "high",
+    "College / University": "college",
+    "Professional training": "professional",
+    "Technical briefing": "professional",
+    "Business presentation": "professional",
+}
+
+STYLE_MAP = {
+    "Academic": "academic",
+    "Storytelling": "storytelling",
+    "Business pitch": "visual",
+    "Technical deep-dive": "technical",
+    "Workshop / interactive": "interactive",
+    "Minimalist": "visual",
+}
+
+LANGUAGE_MAP = {
+    "English": "english",
+    "Hindi": "hindi",
+    "Bilingual (English + Hindi)": "bilingual",
+}
+
+COMPLEXITY_MAP = {
+    "Beginner": "beginner",
+    "Intermediate": "intermediate",
+    "Advanced": "advanced",
+    "Expert": "expert",
+}
+
+
+def _normalize_audience(audience_label: str) -> str:
+    return AUDIENCE_MAP.get(audience_label) or _fallback_audience(audience_label)
+
+
+def _normalize_style(style_label: str) -> str:
+    return STYLE_MAP.get(style_label) or _fallback_style(style_label)
+
+
+def _normalize_language(lang_label: str) -> str:
+    return LANGUAGE_MAP.get(lang_label) or _fallback_language(lang_label)
+
+
+def _normalize_complexity(complexity_label: str) -> str:
+    return COMPLEXITY_MAP.get(complexity_label) or _fallback_complexity(complexity_label)
+
+
+@lru_cache(maxsize=64)
+def _fallback_audience(audience_label: str) -> str:
+    """
+    Backend expects one of:
+    - 'elementary', 'middle', 'high', 'college', 'professional'
+
+    We map your UI options to these buckets.
+    """
+    text = (audience_label or "").lower()
+
+    if "6" in text or "school students" in text:
+        return "elementary"
+    if "11-12" in text or "high school" in text:
+        return "high"
+    if "college" in text or "university" in text:
+        return "college"
+    if "technical briefing" in text:
+        return "professional"
+    if "business presentation" in text:
+        return "professional"
+    if "professional training" in text:
+        return "professional"
+
+    # Safe default
+    return "college"
+
+
+@lru_cache(maxsize=64)
+def _fallback_style(style_label: str) -> str:
+    """
+    Backend expects:
+    - 'academic', 'storytelling', 'interactive', 'technical', 'visual'
+    """
+    text = (style_label or "").lower()
+
+    if "academic" in text:
+        return "academic"
+    if "story" in text:
+        return "storytelling"
+    if "business" in text or "pitch" in text:
+        # Business pitch is usually visual + persuasive
+        return "visual"
+    if "deep" in text or "technical" in text:
+        return "technical"
+    if "workshop" in text or "interactive" in text:
+        return "interactive"
+    if "minimalist" in text:
+        return "visual"
+
+    # Fallback
+    return "academic"
+
+
+@lru_cache(maxsize=64)
+def _fallback_language(lang_label: str) -> str:
+    """
+    Map frontend labels to backend Language enum values.
+    Assuming backend Language enum accepts:
+    - 'english', 'hindi', 'bilingual'
+    """
+    text = (lang_label or "").lower()
+    if "bilingual" in text:
+        return "bilingual"
+    if "hindi" in text:
+        return "hindi"
+    return "english"
+
+
+@lru_cache(maxsize=64)
+def _fallback_complexity(complexity_label: str) -> str:
+    """
+    Forward the complexity as a simple lowercase string.
+
+    If backend uses an enum, it likely expects:
+    - 'beginner', 'intermediate', 'advanced', 'expert'
+    """
+    text = (complexity_label or "intermediate").strip().lower()
+    valid = {"beginner", "intermediate", "advanced", "expert"}
+    return text if text in valid else "intermediate"
+
+
+# --------------------------------------------------
+# RICH TOPIC FOR LLM
+# --------------------------------------------------
+@lru_cache(maxsize=64)
+def _build_rich_topic(
+    topic: str,
+    audience_label: str,
+    style_label: str,
+    language_label: str,
+    complexity_label: str,
+) -> str:
+    """
+    Gamma-like: we pass all user choices into the topic description
+    so the LLM can adapt tone, depth, and format.
+
+    Example:
+    "Understanding AI for Beginners
+     [Audience: College / University | Style: Technical deep-dive |
+      Language: English | Complexity: Intermediate]"
+    """
+    base = (topic or "").strip()
+
+    meta = (
+        f"Audience: {audience_label}; "
+        f"Style: {style_label}; "
+        f"Language: {language_label}; "
+        f"Complexity: {complexity_label}"
+    )
+
+    return f"{base}  [{meta}]"
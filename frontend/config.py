@@ -8,55 +8,65 @@ This file defines:
 """
 
 from dataclasses import dataclass
+from typing import Final
 
 
-@dataclass
+# frozen: option tuples are shared across every Streamlit rerun and must not
+# be mutated. No slots=True: slotted dataclasses drop the class-level
+# defaults, and the app reads them as Config.X without an instance.
+@dataclass(frozen=True)
 class Config:
     # Basic app info
-    APP_TITLE: str = "EduSlide AI – Smart Slide Generator"
-    APP_VERSION: str = "1.0.0"
-    PAGE_ICON: str = "🎓"
+    APP_TITLE: Final[str] = "EduSlide AI – Smart Slide Generator"
+    APP_VERSION: Final[str] = "1.0.0"
+    PAGE_ICON: Final[str] = "🎓"
 
     # Backend API base URL
     # Make sure this matches your FastAPI server
-    BACKEND_URL: str = "http://localhost:8000"
+    BACKEND_URL: Final[str] = "http://localhost:8000"
 
     # Audience options (what user sees in dropdown)
-    AUDIENCE_TYPES = [
+    AUDIENCE_TYPES: Final[tuple[str, ...]] = (
         "School students (6–10)",
         "High school students (11–12)",
         "College / University",
         "Professional training",
         "Technical briefing",
         "Business presentation",
-    ]
+    )
 
     # Presentation style options (what user sees)
-    PRESENTATION_STYLES = [
+    PRESENTATION_STYLES: Final[tuple[str, ...]] = (
         "Academic",
         "Storytelling",
         "Business pitch",
         "Technical deep-dive",
         "Workshop / interactive",
         "Minimalist",
-    ]
+    )
 
     # Supported languages (frontend labels)
-    LANGUAGES = [
+    LANGUAGES: Final[tuple[str, ...]] = (
         "English",
         "Hindi",
         "Bilingual (English + Hindi)",
-    ]
+    )
 
     # Content depth / complexity
-    COMPLEXITY_LEVELS = [
+    COMPLEXITY_LEVELS: Final[tuple[str, ...]] = (
         "Beginner",
         "Intermediate",
         "Advanced",
         "Expert",
-    ]
+    )
 
     # Slide count defaults
-    MIN_SLIDES: int = 5
-    MAX_SLIDES: int = 20
-    DEFAULT_SLIDES: int = 10
+    MIN_SLIDES: Final[int] = 5
+    MAX_SLIDES: Final[int] = 20
+    DEFAULT_SLIDES: Final[int] = 10
+
+
+# Module-level aliases for values read on every rerun (a global lookup is
+# cheaper than an attribute read on the class)
+BACKEND_URL: Final[str] = Config.BACKEND_URL
+APP_VERSION: Final[str] = Config.APP_VERSION
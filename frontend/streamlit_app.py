@@ -2,10 +2,11 @@
 EduSlide AI - Main Streamlit Application
 Personalized Presentation Generation Platform
 """
+import logging
 import streamlit as st
-import time
-import requests     # Added only for fallback download
-from config import Config
+from itertools import islice
+from pathlib import Path
+from config import Config, BACKEND_URL, APP_VERSION
 from api_client import APIClient
 from utils import (
     init_session_state,
@@ -29,7 +30,10 @@ st.set_page_config(
 )
 
 # Custom CSS for better UI
-st.markdown("""
+@st.cache_data(show_spinner=False)
+def _css() -> str:
+    """App stylesheet; built once and reused on every rerun."""
+    return """
 <style>
     .main-header {
         text-align: center;
@@ -70,7 +74,29 @@ st.markdown("""
         box-shadow: 0 2px 4px rgba(0,0,0,0.1);
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+
+st.markdown(_css(), unsafe_allow_html=True)
+
+
+LOGO_PATH = Path(__file__).parent / "assets" / "logo.svg"
+
+
+@st.cache_resource
+def _logo_svg() -> str:
+    """Bundled sidebar logo, read from disk once per process."""
+    return LOGO_PATH.read_text(encoding="utf-8")
+
+
+@st.cache_resource
+def get_api_client() -> APIClient:
+    """
+    One APIClient shared across reruns, so its pooled HTTP session, caches
+    and throttled health result persist for the whole app session.
+    """
+    return APIClient()
+
 
 def render_header():
     """Render application header"""
@@ -81,7 +107,7 @@ def render_header():
             Personalized Presentation Generation Platform
         </p>
         <p style="font-size: 0.9rem; margin-top: 0.5rem; opacity: 0.9;">
-            IIT Bombay Eduthon 2025 | Version {Config.APP_VERSION}
+            IIT Bombay Eduthon 2025 | Version {APP_VERSION}
         </p>
     </div>
     """, unsafe_allow_html=True)
@@ -90,19 +116,18 @@ def render_header():
 def render_sidebar():
     """Render sidebar with settings and info"""
     with st.sidebar:
-        st.image("https://via.placeholder.com/300x100/667eea/ffffff?text=EduSlide+AI", use_container_width=True)
+        st.image(_logo_svg(), use_container_width=True)
 
         st.markdown("---")
 
         st.subheader("🔌 System Status")
-        api_client = APIClient()
 
         with st.spinner("Checking backend..."):
-            health = api_client.check_health()
+            health = get_api_client().cached_health()
 
         if health.get("status") == "healthy":
             st.success("✅ Backend Connected")
-            st.caption(f"Backend: {Config.BACKEND_URL}")
+            st.caption(f"Backend: {BACKEND_URL}")
         else:
             st.error("❌ Backend Offline")
             display_warning_message("Make sure the backend server is running on http://localhost:8000")
@@ -218,14 +243,16 @@ def render_main_form():
             progress_bar = st.progress(0)
             status_text = st.empty()
 
-            api_client = APIClient()
+            api_client = get_api_client()
 
-            status_text.text("📝 Analyzing your topic...")
-            progress_bar.progress(20)
-            time.sleep(0.5)
+            def on_download(received: int, total: int) -> None:
+                # Download is the last stage: map its bytes onto 70–100%
+                status_text.text(f"📥 Downloading PPTX... {received // 1024} KB")
+                if total:
+                    progress_bar.progress(70 + 30 * min(received, total) // total)
 
-            status_text.text("🤖 Generating AI content...")
-            progress_bar.progress(40)
+            status_text.text("📝 Analyzing your topic and generating AI content...")
+            progress_bar.progress(20)
 
             result = api_client.generate_presentation(
                 topic=topic,
@@ -235,21 +262,10 @@ def render_main_form():
                 language=language,
                 complexity=complexity,
                 include_images=include_images,
-                include_notes=include_notes
+                include_notes=include_notes,
+                progress_cb=on_download,
             )
 
-            progress_bar.progress(70)
-            status_text.text("🖼️ Adding images...")
-            time.sleep(0.5)
-
-            progress_bar.progress(90)
-            status_text.text("✨ Finalizing presentation...")
-            time.sleep(0.5)
-
-            progress_bar.progress(100)
-            status_text.text("✅ Complete!")
-            time.sleep(0.5)
-
             progress_bar.empty()
             status_text.empty()
 
@@ -345,24 +361,11 @@ def render_results(result):
             use_container_width=True
         )
 
-    # CASE 2 → file_data missing → try fetching using download_url
+    # CASE 2 → file_data missing → APIClient.download_pptx already retried;
+    #          offer the manual link instead of a second, blocking fetch
     elif download_url:
-        try:
-            r = requests.get(download_url)
-            if r.status_code == 200:
-                st.download_button(
-                    label="⬇️ Download PowerPoint (.pptx)",
-                    data=r.content,
-                    file_name=filename,
-                    mime="application/vnd.openxmlformats-officedocument.presentationml.presentation",
-                    use_container_width=True
-                )
-            else:
-                st.warning("⚠ PPT generated but file unavailable. Use manual link below.")
-                st.code(download_url)
-        except Exception:
-            st.warning("⚠ PPT generated but could not fetch file automatically.")
-            st.code(download_url)
+        st.warning("⚠ PPT generated but file unavailable. Use manual link below.")
+        st.code(download_url)
 
     # CASE 3 → Nothing available
     else:
@@ -375,16 +378,20 @@ def render_results(result):
 
         slides = result.get("slides", [])
         for i, slide in enumerate(slides, 1):
-            with st.expander(f"Slide {i}: {slide.get('title', 'Untitled')}", expanded=(i == 1)):
-                st.markdown(f"### {slide.get('title', 'Untitled')}")
-                st.markdown(slide.get('content', ''))
+            title = slide.get('title') or 'Untitled'
+            with st.expander(f"Slide {i}: {title}", expanded=(i == 1)):
+                # Title, bullets and notes go out as one markdown element
+                content = slide.get('content') or ''
+                if isinstance(content, list):
+                    content = "\n".join(f"- {line}" for line in content)
+                body = f"### {title}\n\n{content}\n"
+                if slide.get('notes'):
+                    body += f"\n> 📝 **Speaker Notes:** {slide['notes']}\n"
+                st.markdown(body)
 
                 if slide.get('image_url'):
                     st.image(slide['image_url'], caption=f"Image for slide {i}", use_container_width=True)
 
-                if slide.get('notes'):
-                    st.info(f"📝 **Speaker Notes:** {slide['notes']}")
-
 
 def render_history():
     """Render generation history"""
@@ -392,7 +399,7 @@ def render_history():
         st.markdown("---")
         st.header("📜 Generation History")
 
-        for item in st.session_state.generation_history[:5]:
+        for item in islice(st.session_state.generation_history, 5):
             status_icon = "✅" if item['status'] == 'success' else "❌"
             with st.expander(f"{status_icon} {item['topic'][:50]}... - {item['timestamp']}"):
                 st.write(f"**Audience:** {item['params'].get('audience')}")
@@ -402,6 +409,8 @@ def render_history():
 
 
 def main():
+    # No-op after the first run: basicConfig only configures an empty root
+    logging.basicConfig(level=logging.INFO)
     init_session_state()
     render_header()
     render_sidebar()
@@ -1,17 +1,76 @@
 """
 Utility functions for the Streamlit frontend
 """
+from __future__ import annotations
+
 import streamlit as st
+from collections import deque
 from datetime import datetime
 import json
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Dict, Any, Final, Mapping
+
+# Descriptions keyed by the exact dropdown labels in Config, built once at
+# import instead of on every rerun
+_STYLE_DESCRIPTIONS: Final[Mapping[str, str]] = MappingProxyType({
+    "Academic": "Formal, structured content with citations and research-based information",
+    "Storytelling": "Narrative-driven with engaging examples and emotional connection",
+    "Business pitch": "Persuasive, data-driven with clear value propositions",
+    "Technical deep-dive": "Detailed technical content with diagrams and specifications",
+    "Workshop / interactive": "Hands-on approach with exercises and participation prompts",
+    "Minimalist": "Clean, simple design with focus on key points"
+})
+
+_AUDIENCE_DESCRIPTIONS: Final[Mapping[str, str]] = MappingProxyType({
+    "School students (6–10)": "Simple language, visual aids, interactive elements",
+    "High school students (11–12)": "Moderate complexity, exam-oriented, practical examples",
+    "College / University": "Academic rigor, research-based, critical thinking focus",
+    "Professional training": "Industry-relevant, skill-building, practical applications",
+    "Technical briefing": "Expert-level, technical depth, specifications and standards",
+    "Business presentation": "Executive summary, ROI focus, strategic insights"
+})
+
+
+# HTML templates for the display_* helpers, built once at import; each call
+# only fills the placeholders with str.format_map
+_INFO_CARD_TEMPLATE: Final[str] = """
+    <div style="
+        padding: 1rem;
+        border-radius: 0.5rem;
+        background-color: #f0f2f6;
+        border-left: 4px solid #1f77b4;
+        margin: 1rem 0;
+    ">
+        <h4 style="margin: 0; color: #1f77b4;">{icon} {title}</h4>
+        <p style="margin: 0.5rem 0 0 0; color: #555;">{content}</p>
+    </div>
+    """
+
+_MESSAGE_TEMPLATE: Final[str] = """
+    <div style="
+        padding: 1rem;
+        border-radius: 0.5rem;
+        background-color: %s;
+        border-left: 4px solid %s;
+        color: %s;
+        margin: 1rem 0;
+    ">
+        %s {message}
+    </div>
+    """
+_SUCCESS_TEMPLATE: Final[str] = _MESSAGE_TEMPLATE % ("#d4edda", "#28a745", "#155724", "✅")
+_ERROR_TEMPLATE: Final[str] = _MESSAGE_TEMPLATE % ("#f8d7da", "#dc3545", "#721c24", "❌")
+_WARNING_TEMPLATE: Final[str] = _MESSAGE_TEMPLATE % ("#fff3cd", "#ffc107", "#856404", "⚠️")
+
+
 def init_session_state():
     """Initialize Streamlit session state variables"""
     if 'presentation_data' not in st.session_state:
         st.session_state.presentation_data = None
     
     if 'generation_history' not in st.session_state:
-        st.session_state.generation_history = []
+        # Bounded: appendleft is O(1) and drops the oldest entry past 10
+        st.session_state.generation_history = deque(maxlen=10)
     
     if 'current_presentation_id' not in st.session_state:
         st.session_state.current_presentation_id = None
@@ -23,11 +82,7 @@ def add_to_history(topic: str, params: Dict[str, Any], status: str):
         "params": params,
         "status": status
     }
-    st.session_state.generation_history.insert(0, history_item)
-    
-    # Keep only last 10 items
-    if len(st.session_state.generation_history) > 10:
-        st.session_state.generation_history = st.session_state.generation_history[:10]
+    st.session_state.generation_history.appendleft(history_item)
 def format_slide_content(slides: list) -> str:
     """Format slides for preview display"""
     formatted = ""
@@ -42,82 +97,24 @@ def format_slide_content(slides: list) -> str:
     return formatted
 def display_info_card(title: str, content: str, icon: str = "ℹ️"):
     """Display an information card"""
-    st.markdown(f"""
-    <div style="
-        padding: 1rem;
-        border-radius: 0.5rem;
-        background-color: #f0f2f6;
-        border-left: 4px solid #1f77b4;
-        margin: 1rem 0;
-    ">
-        <h4 style="margin: 0; color: #1f77b4;">{icon} {title}</h4>
-        <p style="margin: 0.5rem 0 0 0; color: #555;">{content}</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_INFO_CARD_TEMPLATE.format_map(
+        {"icon": icon, "title": title, "content": content}
+    ), unsafe_allow_html=True)
 def display_success_message(message: str):
     """Display success message with custom styling"""
-    st.markdown(f"""
-    <div style="
-        padding: 1rem;
-        border-radius: 0.5rem;
-        background-color: #d4edda;
-        border-left: 4px solid #28a745;
-        color: #155724;
-        margin: 1rem 0;
-    ">
-        ✅ {message}
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_SUCCESS_TEMPLATE.format_map({"message": message}), unsafe_allow_html=True)
 def display_error_message(message: str):
     """Display error message with custom styling"""
-    st.markdown(f"""
-    <div style="
-        padding: 1rem;
-        border-radius: 0.5rem;
-        background-color: #f8d7da;
-        border-left: 4px solid #dc3545;
-        color: #721c24;
-        margin: 1rem 0;
-    ">
-        ❌ {message}
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_ERROR_TEMPLATE.format_map({"message": message}), unsafe_allow_html=True)
 def display_warning_message(message: str):
     """Display warning message with custom styling"""
-    st.markdown(f"""
-    <div style="
-        padding: 1rem;
-        border-radius: 0.5rem;
-        background-color: #fff3cd;
-        border-left: 4px solid #ffc107;
-        color: #856404;
-        margin: 1rem 0;
-    ">
-        ⚠️ {message}
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_WARNING_TEMPLATE.format_map({"message": message}), unsafe_allow_html=True)
 def get_style_description(style: str) -> str:
     """Get description for presentation style"""
-    descriptions = {
-        "Academic": "Formal, structured content with citations and research-based information",
-        "Storytelling": "Narrative-driven with engaging examples and emotional connection",
-        "Business Pitch": "Persuasive, data-driven with clear value propositions",
-        "Technical Deep-Dive": "Detailed technical content with diagrams and specifications",
-        "Workshop/Interactive": "Hands-on approach with exercises and participation prompts",
-        "Minimalist": "Clean, simple design with focus on key points"
-    }
-    return descriptions.get(style, "Custom presentation style")
+    return _STYLE_DESCRIPTIONS.get(style, "Custom presentation style")
 def get_audience_description(audience: str) -> str:
     """Get description for audience type"""
-    descriptions = {
-        "School Students (6-10)": "Simple language, visual aids, interactive elements",
-        "High School (11-12)": "Moderate complexity, exam-oriented, practical examples",
-        "College/University": "Academic rigor, research-based, critical thinking focus",
-        "Professional Training": "Industry-relevant, skill-building, practical applications",
-        "Technical Briefing": "Expert-level, technical depth, specifications and standards",
-        "Business Presentation": "Executive summary, ROI focus, strategic insights"
-    }
-    return descriptions.get(audience, "General audience")
+    return _AUDIENCE_DESCRIPTIONS.get(audience, "General audience")
 def estimate_generation_time(num_slides: int, include_images: bool) -> str:
     """Estimate time to generate presentation"""
     base_time = num_slides * 5  # 5 seconds per slide
@@ -131,10 +128,10 @@ def estimate_generation_time(num_slides: int, include_images: bool) -> str:
         return f"~{minutes} minute(s)"
 def validate_topic(topic: str) -> tuple[bool, str]:
     """Validate the topic input"""
-    if not topic or len(topic.strip()) < 3:
+    if topic is None or len(topic.strip()) < 3:
         return False, "Topic must be at least 3 characters long"
-    
+
     if len(topic) > 500:
         return False, "Topic is too long (max 500 characters)"
-    
+
     return True, "Valid"
\ No newline at end of file